@@ -1,43 +1,28 @@
-import subprocess
+import argparse
+from tournament import run_tournament, pair_record, print_summary
 
-def run_game():
-    result = subprocess.run(
-        ["python", "go_play.py", "-n=5", "-p1=my_player3", "-p2=best_my_player", "-t=0"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    output = result.stdout
+# 进程池在 spawn 模式下会重新导入本脚本，对局只能在主模块中启动
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", "--games", type=int, default=100, help="number of games, colours alternate")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("-j", "--processes", type=int, default=0, help="pool size, 0 uses all cores")
+    parser.add_argument("-m", "--mode", choices=["inproc", "worker", "file"], default="inproc",
+                        help="how players are run, see go_play.py")
+    parser.add_argument("-d", "--deadline", type=float, default=10.0, help="seconds per move in worker mode")
+    args = parser.parse_args()
 
-    if "胜者：X" in output or "Player 1 获胜" in output:
-        return "my_player3"
-    elif "胜者：O" in output or "Player 2 获胜" in output:
-        return "best_my_player"
-    elif "平局" in output or "Tie" in output:
-        return "tie"
-    else:
-        return "error"
+    num_games = args.games
+    results = run_tournament(["my_player3", "best_my_player"], num_games, args.seed, args.processes or None,
+                             mode=args.mode, deadline=args.deadline)
+    wins, ties, losses = pair_record(results, "my_player3", "best_my_player")
+    # 出错和非法落子都算错误局
+    errors = sum(1 for r in results if r.reason in ("error", "illegal"))
 
-num_games = 100
-wins = 0
-losses = 0
-ties = 0
-errors = 0
-
-for i in range(num_games):
-    outcome = run_game()
-    if outcome == "my_player3":
-        wins += 1
-    elif outcome == "best_my_player":
-        losses += 1
-    elif outcome == "tie":
-        ties += 1
-    else:
-        errors += 1
-
-print(f"总对局数: {num_games}")
-print(f"胜利局数: {wins} | 正确率: {wins/num_games:.2%}")
-print(f"失败局数: {losses} | 错误率: {losses/num_games:.2%}")
-print(f"平局局数: {ties}")
-if errors > 0:
-    print(f"⚠️ 错误局数: {errors}")
+    print(f"总对局数: {num_games}")
+    print(f"胜利局数: {wins} | 正确率: {wins/num_games:.2%}")
+    print(f"失败局数: {losses} | 错误率: {losses/num_games:.2%}")
+    print(f"平局局数: {ties}")
+    if errors > 0:
+        print(f"⚠️ 错误局数: {errors}")
+    print_summary(results, ["my_player3", "best_my_player"])
@@ -0,0 +1,66 @@
+import argparse
+import os
+import random
+import time
+
+import my_player2
+
+def sample_states(count, seed):
+    '''
+    Positions to benchmark on, taken from random games of 0 to 12 moves.
+
+    :param count: number of positions.
+    :param seed: seed of the random games.
+    :return: list of my_player2.GoGame.
+    '''
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        board = [[0] * my_player2.BOARD_SIZE for _ in range(my_player2.BOARD_SIZE)]
+        state = my_player2.GoGame(board, [row[:] for row in board], 1)
+        for _ in range(rng.randrange(13)):
+            moves = state.get_legal_moves()
+            if moves == ["PASS"]:
+                break
+            state = state.do_move(rng.choice(moves))
+        states.append(state)
+    return states
+
+def bench(processes, states, time_limit, batch_size):
+    '''
+    Playouts per second of one MCTS setting over the sample positions.
+
+    The first search only starts the process pool and is not timed, the same way a
+    player pays for its pool once per game.
+
+    :return: playouts per second.
+    '''
+    agent = my_player2.MCTS(time_limit=time_limit, batch_size=batch_size, processes=processes)
+    agent.get_best_move(states[0])
+    playouts = 0
+    elapsed = 0.0
+    for state in states:
+        start = time.perf_counter()
+        agent.get_best_move(state)
+        elapsed += time.perf_counter() - start
+        playouts += agent.playouts
+    return playouts / elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-j", "--processes", type=int, default=0, help="largest pool size, 0 uses all cores")
+    parser.add_argument("-t", "--time", type=float, default=0.9, help="seconds per move")
+    parser.add_argument("-p", "--positions", type=int, default=10, help="positions searched per pool size")
+    parser.add_argument("-b", "--batch", type=int, default=0, help="batched playouts per leaf, 0 plays them one by one")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the sample positions")
+    args = parser.parse_args()
+
+    states = sample_states(args.positions, args.seed)
+    base = None
+    for processes in range(1, (args.processes or os.cpu_count()) + 1):
+        rate = bench(processes, states, args.time, args.batch or None)
+        base = base or rate
+        print(f"{processes} processes: {rate:.0f} playouts/s, x{rate / base:.2f}")
+
+if __name__ == "__main__":
+    main()
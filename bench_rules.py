@@ -0,0 +1,332 @@
+import abc
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Fixed positions, X black and O white: (side to move, previous board, board).
+# The previous board is the position before the last move, so the ko fight has the ko point forbidden.
+CORPUS = {
+    "empty": (1, """.....
+.....
+.....
+.....
+.....""", """.....
+.....
+.....
+.....
+....."""),
+    "opening": (1, """.....
+.X...
+..XO.
+.....
+.....""", """.....
+.X...
+..XO.
+...O.
+....."""),
+    "ko fight": (2, """.XO..
+XO.O.
+.XO..
+...X.
+.O...""", """.XO..
+X.XO.
+.XO..
+...X.
+.O..."""),
+    "big capture": (1, """XXXX.
+OOOO.
+XXXX.
+.O...
+.....""", """XXXX.
+OOOO.
+XXXX.
+.O.O.
+....."""),
+    "endgame": (1, """XXO.O
+X.XOO
+XXXO.
+OX.OO
+.OOX.""", """XXO.O
+X.XOO
+XXXO.
+OXOOO
+.OOX."""),
+}
+
+def parse_board(rows):
+    return [[".XO".index(c) for c in row] for row in rows.split()]
+
+class Rules(abc.ABC):
+    '''
+    Uniform view of one rules implementation for the benchmark.
+
+    A state is whatever the implementation plays on. perft and apply_all copy states
+    by default; implementations with make/unmake override them.
+    '''
+    @abc.abstractmethod
+    def load(self, color, prev_board, board):
+        pass
+
+    @abc.abstractmethod
+    def moves(self, state):
+        pass
+
+    @abc.abstractmethod
+    def play(self, state, move):
+        pass
+
+    @abc.abstractmethod
+    def evaluate(self, state):
+        pass
+
+    def reset(self):
+        # Drop caches, so repeated timings do not just measure cache hits
+        pass
+
+    def apply_all(self, state, moves):
+        for move in moves:
+            self.play(state, move)
+
+    def perft(self, state, depth):
+        '''
+        Leaves of the move tree at depth, passes left out, the last ply counted without playing it.
+
+        :return: number of leaves.
+        '''
+        moves = self.moves(state)
+        if depth <= 1:
+            return len(moves) if depth == 1 else 1
+        return sum(self.perft(self.play(state, move), depth - 1) for move in moves)
+
+class HostRules(Rules):
+    # host.GO on bitboards, searched with make_move/unmake_move; a state is (GO, side to move)
+    def __init__(self):
+        self.host = importlib.import_module("host")
+
+    def load(self, color, prev_board, board):
+        go = self.host.GO(len(board))
+        go.set_board(color, prev_board, board)
+        go.X_move = color == 1
+        return go, color
+
+    def moves(self, state):
+        go, color = state
+        n = go.size
+        return [(i, j) for i in range(n) for j in range(n) if go.valid_place_check(i, j, color, test_check=True)]
+
+    def play(self, state, move):
+        go, color = state
+        child = go.copy_board()
+        child.make_move(move[0], move[1], color)
+        return child, 3 - color
+
+    def evaluate(self, state):
+        go, color = state
+        return go.score(color) - go.score(3 - color)
+
+    def apply_all(self, state, moves):
+        go, color = state
+        for i, j in moves:
+            go.make_move(i, j, color)
+            go.unmake_move()
+
+    def perft(self, state, depth):
+        go, color = state
+        moves = self.moves(state)
+        if depth <= 1:
+            return len(moves) if depth == 1 else 1
+        leaves = 0
+        for i, j in moves:
+            go.make_move(i, j, color)
+            leaves += self.perft((go, 3 - color), depth - 1)
+            go.unmake_move()
+        return leaves
+
+class NumpyRules(Rules):
+    # GoGame of my_player3 or my_player4; a state is (previous board, board, side to move) as arrays
+    def __init__(self, module):
+        self.game = importlib.import_module(module).GoGame()
+
+    def load(self, color, prev_board, board):
+        return np.array(prev_board, dtype=int), np.array(board, dtype=int), color
+
+    def moves(self, state):
+        prev, board, color = state
+        return self.game.list_legal_moves(board, prev, color)
+
+    def play(self, state, move):
+        prev, board, color = state
+        return board, self.game.simulate_move(board, move, color), 3 - color
+
+    def evaluate(self, state):
+        prev, board, color = state
+        return self.game.evaluate_board_state(board, color)
+
+    def reset(self):
+        self.game.analysis_cache.clear()
+
+class ListRules(Rules):
+    # Module functions of my_player; a state is (previous board, board, side to move) as lists
+    def __init__(self):
+        self.player = importlib.import_module("my_player")
+
+    def load(self, color, prev_board, board):
+        return prev_board, board, color
+
+    def moves(self, state):
+        prev, board, color = state
+        return self.player.find_valid_moves(board, prev, color)
+
+    def play(self, state, move):
+        prev, board, color = state
+        return board, self.player.make_move(board, move, color), 3 - color
+
+    def evaluate(self, state):
+        prev, board, color = state
+        return self.player.heuristic(board, color)
+
+class ObjectRules(Rules):
+    # GoGame of my_player2, one object per state
+    def __init__(self):
+        self.player = importlib.import_module("my_player2")
+
+    def load(self, color, prev_board, board):
+        return self.player.GoGame(board, prev_board, color)
+
+    def moves(self, state):
+        return [move for move in state.get_legal_moves() if move != "PASS"]
+
+    def play(self, state, move):
+        return state.do_move(move)
+
+    def evaluate(self, state):
+        return state.evaluate(state.piece_type)
+
+IMPLEMENTATIONS = {
+    "host": HostRules,
+    "my_player": ListRules,
+    "my_player2": ObjectRules,
+    "my_player3": lambda: NumpyRules("my_player3"),
+    "my_player4": lambda: NumpyRules("my_player4"),
+}
+
+def rate(count, seconds):
+    return count / seconds if seconds > 0 else float("inf")
+
+def measure(rules, color, prev_board, board, depth, repeat):
+    '''
+    Benchmark one implementation on one position.
+
+    :param rules: Rules instance.
+    :param depth: perft depth.
+    :param repeat: repetitions of the move generation, move application and evaluation timings.
+    :return: dict of perft leaves, perft leaves/s, move generations/s, moves applied/s,
+        evaluations/s and the peak memory traced during perft in KB.
+    '''
+    state = rules.load(color, prev_board, board)
+    rules.reset()
+    start = time.perf_counter()
+    leaves = rules.perft(state, depth)
+    perft_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rules.reset()
+        moves = rules.moves(state)
+    movegen_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rules.reset()
+        rules.apply_all(state, moves)
+    apply_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rules.reset()
+        rules.evaluate(state)
+    evaluate_time = time.perf_counter() - start
+
+    rules.reset()
+    tracemalloc.start()
+    rules.perft(state, depth)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"leaves": leaves, "perft": rate(leaves, perft_time), "movegen": rate(repeat, movegen_time),
+            "apply": rate(repeat * len(moves), apply_time), "evaluate": rate(repeat, evaluate_time),
+            "alloc_kb": peak / 1024}
+
+def run_child(name, depth, repeat):
+    '''
+    Benchmark one implementation over the corpus in this process and print the results as JSON.
+
+    Each implementation runs in its own process so that the peak RSS belongs to it alone.
+    '''
+    rules = IMPLEMENTATIONS[name]()
+    results = {}
+    for position, (color, prev_rows, rows) in CORPUS.items():
+        results[position] = measure(rules, color, parse_board(prev_rows), parse_board(rows), depth, repeat)
+    # ru_maxrss is in KB on Linux
+    print(json.dumps({"results": results, "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+def run_implementation(name, depth, repeat):
+    command = [sys.executable, os.path.abspath(__file__), "--child", name, "-d", str(depth), "-r", str(repeat)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def print_report(reports, depth):
+    for position in CORPUS:
+        print(f"== {position} ==")
+        print(f"{'implementation':<12} {'perft(' + str(depth) + ')':>10} {'leaves/s':>10} {'movegen/s':>10} "
+              f"{'apply/s':>10} {'eval/s':>10} {'alloc KB':>9}")
+        for name, report in reports.items():
+            r = report["results"][position]
+            print(f"{name:<12} {r['leaves']:>10} {r['perft']:>10.0f} {r['movegen']:>10.0f} "
+                  f"{r['apply']:>10.0f} {r['evaluate']:>10.0f} {r['alloc_kb']:>9.0f}")
+    print("== peak RSS ==")
+    for name, report in reports.items():
+        print(f"{name:<12} {report['rss_kb'] / 1024:.1f} MB")
+
+def disagreements(reports):
+    '''
+    Positions where the implementations count different perft leaves.
+
+    :return: list of (position, dict leaf count -> implementations with that count).
+    '''
+    found = []
+    for position in CORPUS:
+        counts = {}
+        for name, report in reports.items():
+            counts.setdefault(report["results"][position]["leaves"], []).append(name)
+        if len(counts) > 1:
+            found.append((position, counts))
+    return found
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("implementations", nargs="*", default=list(IMPLEMENTATIONS),
+                        help=f"implementations to benchmark, any of {', '.join(IMPLEMENTATIONS)}")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="perft depth")
+    parser.add_argument("-r", "--repeat", type=int, default=200, help="repetitions of the other timings")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.depth, args.repeat)
+        return
+    reports = {name: run_implementation(name, args.depth, args.repeat) for name in args.implementations}
+    print_report(reports, args.depth)
+    for position, counts in disagreements(reports):
+        groups = ", ".join(f"{' '.join(names)}: {leaves}" for leaves, names in sorted(counts.items()))
+        print(f"⚠️ perft({args.depth}) disagrees on {position}: {groups}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+import my_player3
+
+# (label, MiniMaxAI settings): move orderings with plain alpha-beta, then PVS and aspiration windows on top
+SEARCHES = [("ordering none", dict(ordering="none", pvs=False, aspiration=None)),
+            ("ordering tt", dict(ordering="tt", pvs=False, aspiration=None)),
+            ("ordering full", dict(ordering="full", pvs=False, aspiration=None)),
+            ("full + pvs", dict(ordering="full", pvs=True, aspiration=None)),
+            ("full + aspiration", dict(ordering="full", pvs=False)),
+            ("full + pvs + aspiration", dict(ordering="full", pvs=True))]
+
+def sample_positions(count, seed, size=5):
+    '''
+    Positions to benchmark on, taken from random games of 2 to 12 moves.
+
+    :param count: number of positions.
+    :param seed: seed of the random games.
+    :param size: board size.
+    :return: list of (color, previous board, board) as nested lists.
+    '''
+    rng = random.Random(seed)
+    game = my_player3.GoGame(size)
+    positions = []
+    while len(positions) < count:
+        board = np.zeros((size, size), dtype=int)
+        prev, color = board, 1
+        for _ in range(rng.randrange(2, 13)):
+            moves = game.list_legal_moves(board, prev, color)
+            if not moves:
+                break
+            prev, board, color = board, game.simulate_move(board, rng.choice(moves), color), 3 - color
+        if game.list_legal_moves(board, prev, color):
+            positions.append((color, prev.tolist(), board.tolist()))
+    return positions
+
+def bench_minimax(positions, depth, settings):
+    '''
+    Nodes my_player3's MiniMaxAI visits with one search setting, iterating to a fixed depth.
+
+    :param settings: keyword arguments of MiniMaxAI.
+    :return: (nodes, seconds).
+    '''
+    nodes = 0
+    start = time.perf_counter()
+    for color, prev, board in positions:
+        game = my_player3.GoGame(len(board))
+        game.load_boards(color, prev, board)
+        ai = my_player3.MiniMaxAI(game, depth=depth, **settings)
+        ai.iterate(game.list_legal_moves(game.board, game.prev_board, color), time.time())
+        nodes += ai.nodes
+    return nodes, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", "--depth", type=int, default=4, help="search depth of my_player3")
+    parser.add_argument("-p", "--positions", type=int, default=20, help="number of sample positions")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the sample positions")
+    parser.add_argument("-a", "--aspiration", type=float, default=10, help="half width of the aspiration window")
+    args = parser.parse_args()
+
+    positions = sample_positions(args.positions, args.seed)
+    base = None
+    for label, settings in SEARCHES:
+        nodes, seconds = bench_minimax(positions, args.depth, dict({"aspiration": args.aspiration}, **settings))
+        base = base or nodes
+        print(f"my_player3 depth {args.depth}, {label}: {nodes} nodes ({nodes / base:.0%}), {seconds:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import importlib
+import multiprocessing
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from my_player3 import BOOK_ENTRY, BOOK_HEADER, BOOK_MAGIC, OPENING_BOOK, GoGame
+
+_engine = None # Player module searched by this pool process
+
+def init_process(player):
+    global _engine
+    _engine = importlib.import_module(player)
+
+def book_positions(game, plies):
+    '''
+    Collect the opening positions to search, one per symmetry class.
+
+    Plays out every sequence of up to plies stones from the empty board, black first.
+    Passes are left out and nothing can be captured this early, so the previous board
+    is simply the board before the last stone.
+
+    :param game: GoGame of the board size.
+    :param plies: stones on the deepest positions.
+    :return: dict canonical key -> (color, previous board, board).
+    '''
+    n = game.BOARD_SIZE
+    empty = np.zeros((n, n), dtype=int)
+    positions = {}
+    frontier = [(1, empty, empty)]
+    for ply in range(plies + 1):
+        next_frontier = []
+        for color, prev, board in frontier:
+            key, _ = game.canonical_hash(board, color)
+            if key in positions:
+                continue
+            positions[key] = (color, prev, board)
+            if ply < plies:
+                for move in game.list_legal_moves(board, prev, color):
+                    next_frontier.append((3 - color, board, game.simulate_move(board, move, color)))
+        frontier = next_frontier
+    return positions
+
+def search_position(task):
+    '''
+    Search one book position with the player's MiniMaxAI.
+
+    :param task: (color, previous board, board, depth, time limit, seed).
+    :return: (canonical key, move index in the canonical orientation), or None if the engine passes.
+    '''
+    color, prev, board, depth, time_limit, seed = task
+    random.seed(seed)
+    game = _engine.GoGame(len(board))
+    game.load_boards(color, prev.tolist(), board.tolist())
+    move = _engine.MiniMaxAI(game, depth=depth, time_limit=time_limit).choose_best_move()
+    if move == "PASS":
+        return None
+    key, t = game.canonical_hash(game.board, color)
+    return key, int(game.inverse_symmetries[t][move[0] * game.BOARD_SIZE + move[1]])
+
+def write_book(path, entries, board_size):
+    '''
+    Write a book file: header, then the entries sorted by key for binary search.
+
+    The file is written under a temporary name and renamed, so a player never reads half a book.
+
+    :param path: book file.
+    :param entries: list of (canonical key, move index).
+    :param board_size: board size.
+    :return: None.
+    '''
+    header = np.zeros(1, dtype=BOOK_HEADER)
+    header[0] = (BOOK_MAGIC, board_size)
+    book = np.array(sorted(entries), dtype=BOOK_ENTRY)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, "wb") as f:
+        f.write(header.tobytes())
+        f.write(book.tobytes())
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--player", default="my_player3", help="player module whose GoGame and MiniMaxAI are searched")
+    parser.add_argument("-l", "--plies", type=int, default=2, help="stones on the deepest book positions")
+    parser.add_argument("-d", "--depth", type=int, default=25, help="maximum search depth")
+    parser.add_argument("-t", "--time", type=float, default=5.0, help="seconds per position")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first position")
+    parser.add_argument("-j", "--processes", type=int, default=0, help="pool size, 0 uses all cores")
+    parser.add_argument("-n", type=int, default=5, help="board size")
+    parser.add_argument("-o", "--output", default=OPENING_BOOK, help="book file")
+    args = parser.parse_args()
+
+    positions = book_positions(GoGame(args.n), args.plies)
+    tasks = [(color, prev, board, args.depth, args.time, args.seed + k)
+             for k, (color, prev, board) in enumerate(positions.values())]
+    print(f"{len(tasks)} positions")
+    with multiprocessing.Pool(args.processes or os.cpu_count(), initializer=init_process,
+                              initargs=(args.player,)) as pool:
+        entries = [entry for entry in pool.map(search_position, tasks, chunksize=1) if entry is not None]
+    write_book(args.output, entries, args.n)
+    print(f"{len(entries)} moves written to {args.output}")
+
+if __name__ == "__main__":
+    main()
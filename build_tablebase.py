@@ -0,0 +1,157 @@
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from my_player3 import ENDGAME_TABLE, TABLE_ENTRY, TABLE_HEADER, TABLE_MAGIC, GoGame, ProofNumberSolver
+
+def sample_states(game, games, max_empty, seed):
+    '''
+    Collect reachable endgame states from random games.
+
+    Every side plays a uniformly random move that is legal under host.py's rules
+    (own-eye fills included) and passes only when it has none, for the host's n*n-1
+    moves. A state is kept when it has at most max_empty empty points and no ko
+    restriction, and at least one move is left.
+
+    :param game: GoGame of the board size.
+    :param games: number of random games.
+    :param max_empty: most empty points of a kept state.
+    :param seed: seed of the random games.
+    :return: list of (board, previous board, color, moves left, passes), one per state key.
+    '''
+    rng = random.Random(seed)
+    n = game.BOARD_SIZE
+    states = {}
+    for _ in range(games):
+        board = np.zeros((n, n), dtype=int)
+        prev, color, passes = board, 1, 0
+        for played in range(n * n - 1):
+            moves_left = n * n - 1 - played
+            if np.count_nonzero(board == 0) <= max_empty:
+                state = game.state_hash(board, prev, color, moves_left, passes)
+                if state is not None:
+                    states.setdefault(state[0], (board, prev, color, moves_left, passes))
+            moves = game.list_legal_moves(board, prev, color, fill_eyes=True)
+            if moves:
+                prev, board, passes = board, game.simulate_move(board, rng.choice(moves), color), 0
+            else:
+                prev, passes = board, passes + 1
+                if passes == 2:
+                    break
+            color = 3 - color
+    return list(states.values())
+
+def solve(game, solver, board, prev, color, moves_left, passes, memo):
+    '''
+    Exact result of a state for the side to move, by negamax over win, draw and loss.
+
+    Moves are generated under host.py's rules, so own-eye fills, which GoGame's
+    search leaves out, are searched as well.
+
+    Every state without a ko restriction is memoised under its state key, so the
+    states of the subtree are solved along the way.
+
+    :param solver: ProofNumberSolver of the board size, used for the host's scoring.
+    :param memo: dict state key -> (result, move index in the canonical orientation, empty points).
+    :return: 1 win, 0 draw, -1 loss.
+    '''
+    if passes >= 2 or moves_left <= 0:
+        winner = solver.winner(board)
+        return 0 if winner == 0 else (1 if winner == color else -1)
+    state = game.state_hash(board, prev, color, moves_left, passes)
+    if state is not None and state[0] in memo:
+        return memo[state[0]][0]
+    n = game.BOARD_SIZE
+    best, best_move = -2, n * n
+    for move in game.list_legal_moves(board, prev, color, fill_eyes=True):
+        value = -solve(game, solver, game.simulate_move(board, move, color), board, 3 - color, moves_left - 1, 0, memo)
+        if value > best:
+            best, best_move = value, move[0] * n + move[1]
+            if best == 1:
+                break
+    if best < 1:
+        value = -solve(game, solver, board, board, 3 - color, moves_left - 1, passes + 1, memo)
+        if value > best:
+            best, best_move = value, n * n
+    if state is not None:
+        key, t = state
+        memo[key] = (best, best_move if best_move == n * n else int(game.inverse_symmetries[t][best_move]),
+                     int(np.count_nonzero(board == 0)))
+    return best
+
+def solve_states(task):
+    '''
+    Solve a chunk of sampled states in one pool process.
+
+    :param task: (board size, max empty points, list of states).
+    :return: list of (state key, result, canonical move index) with at most max_empty empty points.
+    '''
+    board_size, max_empty, states = task
+    game = GoGame(board_size)
+    solver = ProofNumberSolver(game)
+    memo = {}
+    for board, prev, color, moves_left, passes in states:
+        solve(game, solver, board, prev, color, moves_left, passes, memo)
+    return [(key, value, move) for key, (value, move, empty) in memo.items() if empty <= max_empty]
+
+def write_table(path, entries, board_size, max_empty):
+    '''
+    Write a tablebase file: header, then an open-addressing hash table of the entries.
+
+    The table has a power-of-two number of slots, at least twice the entries, and a
+    key goes to slot key & (slots - 1) or the next free one, the way
+    my_player3.EndgameTable.probe looks it up. The file is written under a temporary
+    name and renamed, so a player never maps half a table.
+
+    :param path: tablebase file.
+    :param entries: dict state key -> (result, canonical move index).
+    :param board_size: board size.
+    :param max_empty: most empty points of a stored state.
+    :return: None.
+    '''
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+    table = np.zeros(slots, dtype=TABLE_ENTRY)
+    for key, (value, move) in entries.items():
+        i = key & (slots - 1)
+        while table[i]['key']:
+            i = (i + 1) & (slots - 1)
+        table[i] = (key, value, move)
+    header = np.zeros(1, dtype=TABLE_HEADER)
+    header[0] = (TABLE_MAGIC, board_size, max_empty, slots)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, "wb") as f:
+        f.write(header.tobytes())
+        f.write(table.tobytes())
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-k", "--empty", type=int, default=6, help="most empty points of a stored state")
+    parser.add_argument("-g", "--games", type=int, default=2000, help="random games to sample states from")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the random games")
+    parser.add_argument("-j", "--processes", type=int, default=0, help="pool size, 0 uses all cores")
+    parser.add_argument("-n", type=int, default=5, help="board size")
+    parser.add_argument("-o", "--output", default=ENDGAME_TABLE, help="tablebase file")
+    args = parser.parse_args()
+
+    game = GoGame(args.n)
+    states = sample_states(game, args.games, args.empty, args.seed)
+    print(f"{len(states)} sampled states")
+    processes = args.processes or os.cpu_count()
+    tasks = [(args.n, args.empty, states[k::processes]) for k in range(processes)]
+    entries = {}
+    with multiprocessing.Pool(processes) as pool:
+        for chunk in pool.imap_unordered(solve_states, tasks):
+            for key, value, move in chunk:
+                entries[key] = (value, move)
+    write_table(args.output, entries, args.n, args.empty)
+    print(f"{len(entries)} states written to {args.output}")
+
+if __name__ == "__main__":
+    main()
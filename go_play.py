@@ -1,11 +1,16 @@
 import argparse
+import importlib
+import shlex
 import subprocess
 import os
 import sys
 import time
-from read import readInput
 from write import writeNextInput
 from host import GO
+from player_worker import WorkerPlayer
+
+# 玩家脚本所在目录；文件协议的 input.txt/output.txt 则放在当前工作目录
+PLAYER_DIR = os.path.dirname(os.path.abspath(__file__))
 
 def print_board(board):
     symbols = {0: '.', 1: 'X', 2: 'O'}
@@ -13,6 +18,26 @@ def print_board(board):
         print(" ".join(symbols[cell] for cell in row))
     print()
 
+def load_player(player_script, mode, deadline=10.0):
+    # inproc：只导入一次玩家模块；worker：启动一个常驻进程，通过 stdin/stdout 逐行通信
+    # 没有 get_move 的 Python 脚本（如 random_player）仍走文件协议
+    if player_script == "manual" or mode == "file":
+        return None
+    script = os.path.join(PLAYER_DIR, f"{player_script}.py")
+    if not os.path.exists(script):
+        # 非 Python 玩家（如编译好的 C++/Java）直接按命令行启动为 worker
+        return WorkerPlayer(shlex.split(player_script), deadline) if mode == "worker" else None
+    module = importlib.import_module(player_script)
+    if not hasattr(module, "get_move"):
+        return None
+    if mode == "worker":
+        return WorkerPlayer([sys.executable, script, "--worker"], deadline)
+    return module
+
+def close_player(player):
+    if isinstance(player, WorkerPlayer):
+        player.close()
+
 def call_player(player_script):
     # 执行AI或玩家脚本
     if player_script == "manual":
@@ -23,57 +48,61 @@ def call_player(player_script):
             else:
                 f.write(move.strip())
     else:
-        subprocess.run(["python", f"{player_script}.py"])
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-n", type=int, default=5, help="board size")
-    parser.add_argument("-p1", type=str, default="my_player", help="player 1 script (no .py)")
-    parser.add_argument("-p2", type=str, default="random_player", help="player 2 script")
-    parser.add_argument("-t", type=int, default=1, help="print board")
-    args = parser.parse_args()
-
-    size = args.n
-    p1 = args.p1
-    p2 = args.p2
-    verbose = args.t == 1
-
-    # 初始化空棋盘
-    empty_board = [[0] * size for _ in range(size)]
-    writeNextInput(1, empty_board, empty_board)
+        subprocess.run(["python", os.path.join(PLAYER_DIR, f"{player_script}.py")])
+
+def read_action():
+    # 读取 output.txt 中的落子
+    with open("output.txt", "r") as f:
+        line = f.readline().strip()
+        if line == "PASS":
+            return "PASS", -1, -1
+        x, y = map(int, line.split(","))
+        return "MOVE", x, y
+
+def get_action(player_script, player, piece_type, go):
+    # 同进程模块或常驻 worker 直接取落子，否则按文件协议调用脚本
+    if player is not None:
+        move = player.get_move(piece_type, go.previous_board, go.board)
+        if move == "PASS":
+            return "PASS", -1, -1
+        return "MOVE", int(move[0]), int(move[1])
+    writeNextInput(piece_type, go.previous_board, go.board)
+    call_player(player_script)
+    return read_action()
+
+def record_stats(stats, go, moves, times, reason):
+    # 记录对局统计：手数、黑方视角的贴目后子数差、双方用时、结束原因（score/illegal/error）
+    if stats is not None:
+        stats.update(moves=moves, margin=go.score(1) - go.score(2) - go.komi, time=times, reason=reason)
+
+def play_game(size, p1, p2, players, verbose=False, stats=None):
+    # 进行一局对局，返回胜者（0 为平局）；players 为 load_player 的结果，可在多局之间复用
+    # 传入 stats 字典时填入 record_stats 的统计信息
+    go = GO(size)
+    go.init_board(size)
 
     piece_type = 1
     moves = 0
     consecutive_passes = 0
+    times = {1: 0.0, 2: 0.0}
 
     while True:
         if verbose:
             print(f"=== Turn {moves+1} | Player {piece_type} ({'X' if piece_type==1 else 'O'}) ===")
 
-        # 调用玩家
+        # 调用玩家并读取输出
         current_player = p1 if piece_type == 1 else p2
-        call_player(current_player)
-
-        # 读取输出
+        start = time.perf_counter()
         try:
-            with open("output.txt", "r") as f:
-                line = f.readline().strip()
-                if line == "PASS":
-                    action = "PASS"
-                    x, y = -1, -1
-                else:
-                    x, y = map(int, line.split(","))
-                    action = "MOVE"
-        except:
+            action, x, y = get_action(current_player, players[piece_type], piece_type, go)
+        except Exception:
             print("读取 output.txt 失败，游戏结束")
             winner = 2 if piece_type == 1 else 1
             print(f"Player {piece_type} 出错，Player {winner} 获胜")
-            return
-
-        # 读取棋盘
-        piece_type_file, prev_board, curr_board = readInput(size)
-        go = GO(size)
-        go.set_board(piece_type, prev_board, curr_board)
+            record_stats(stats, go, moves, times, "error")
+            return winner
+        finally:
+            times[piece_type] += time.perf_counter() - start
 
         # 执行落子
         valid = True
@@ -85,31 +114,52 @@ def main():
                 print(f"非法落子 ({x},{y})，Player {piece_type} 失败")
                 winner = 2 if piece_type == 1 else 1
                 print(f"Player {winner} 获胜")
-                return
+                record_stats(stats, go, moves, times, "illegal")
+                return winner
             consecutive_passes = 0
         else:
             go.previous_board = go.board
             consecutive_passes += 1
 
+        # 和 host.py 一样每手（包括停一手）计数，满 n*n-1 手时 game_end 结束对局
+        go.n_move += 1
+
         if verbose:
             print_board(go.board)
 
-        # 判断游戏结束
-        if go.game_end(piece_type, action) or consecutive_passes >= 2:
+        # 判断游戏结束：满 n*n-1 手，或者和 host.judge 一样连续两次停一手
+        # （停一手时 previous_board 已经等于 board，不能再让 game_end 按 "PASS" 比较）
+        if go.game_end(piece_type) or consecutive_passes >= 2:
             winner = go.judge_winner()
             print("\n游戏结束！")
             if winner == 0:
                 print("平局！")
             else:
                 print(f"Player {winner} 获胜 ({'X' if winner==1 else 'O'})")
-            return
-
-        # 写回 input.txt 给下一位玩家
-        next_piece_type = 2 if piece_type == 1 else 1
-        writeNextInput(next_piece_type, go.previous_board, go.board)
+            record_stats(stats, go, moves + 1, times, "score")
+            return winner
 
-        piece_type = next_piece_type
+        piece_type = 2 if piece_type == 1 else 1
         moves += 1
 
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=5, help="board size")
+    parser.add_argument("-p1", type=str, default="my_player", help="player 1 script (no .py) or worker command")
+    parser.add_argument("-p2", type=str, default="random_player", help="player 2 script")
+    parser.add_argument("-t", type=int, default=1, help="print board")
+    parser.add_argument("-m", "--mode", choices=["inproc", "worker", "file"], default="inproc",
+                        help="inproc: import players once and call get_move; worker: start each player once "
+                             "and talk over stdin/stdout; file: run each move through input.txt/output.txt")
+    parser.add_argument("-d", "--deadline", type=float, default=10.0, help="seconds per move in worker mode")
+    args = parser.parse_args()
+
+    players = {1: load_player(args.p1, args.mode, args.deadline), 2: load_player(args.p2, args.mode, args.deadline)}
+    try:
+        play_game(args.n, args.p1, args.p2, players, args.t == 1)
+    finally:
+        close_player(players[1])
+        close_player(players[2])
+
 if __name__ == "__main__":
     main()
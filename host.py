@@ -4,16 +4,89 @@ import timeit
 import math
 import argparse
 from collections import Counter
-from copy import deepcopy
+from copy import copy
 
 from read import *
 from write import writeNextInput
 
+_BOARD_MASKS = {}
+_ZOBRIST_KEYS = {}
+
+def board_masks(n):
+    '''
+    Get the precomputed bitboard masks of an n*n board.
+
+    A bitboard is an integer in which bit i*n + j stands for position (i, j).
+    The masks are built once per board size and shared by every GO instance.
+
+    :param n: size of the board n*n.
+    :return: (full, not_left, not_right, neighbors, adjacent). full covers every point, not_left and
+        not_right clear the first and last column so one-bit shifts do not wrap around rows,
+        neighbors[k] is the mask of the points adjacent to point k and adjacent[k] lists their indices.
+    '''
+    masks = _BOARD_MASKS.get(n)
+    if masks is None:
+        full = (1 << (n * n)) - 1
+        left = 0
+        for i in range(n):
+            left |= 1 << (i * n)
+        right = left << (n - 1)
+        neighbors = []
+        adjacent = []
+        for i in range(n):
+            for j in range(n):
+                points = []
+                if i > 0: points.append((i - 1) * n + j)
+                if i < n - 1: points.append((i + 1) * n + j)
+                if j > 0: points.append(i * n + j - 1)
+                if j < n - 1: points.append(i * n + j + 1)
+                mask = 0
+                for k in points:
+                    mask |= 1 << k
+                neighbors.append(mask)
+                adjacent.append(tuple(points))
+        masks = (full, full & ~left, full & ~right, neighbors, adjacent)
+        _BOARD_MASKS[n] = masks
+    return masks
+
+def zobrist_keys(n):
+    '''
+    Get the Zobrist keys of an n*n board.
+
+    The keys come from a generator seeded with the board size, so a position hashes
+    to the same value in every process and can be stored on disk.
+
+    :param n: size of the board n*n.
+    :return: list indexed by piece type (index 0 unused) of 64-bit keys, one per point.
+    '''
+    keys = _ZOBRIST_KEYS.get(n)
+    if keys is None:
+        rng = random.Random(n)
+        keys = [None] + [[rng.getrandbits(64) for _ in range(n * n)] for _ in (1, 2)]
+        _ZOBRIST_KEYS[n] = keys
+    return keys
+
+def popcount(mask):
+    '''
+    Count the stones in a bitboard.
+
+    :param mask: bitboard.
+    :return: number of set bits.
+    '''
+    return bin(mask).count('1')
+
 class GO:
     def __init__(self, n):
         """
         Go game.
 
+        The position is kept as one bitboard per color (see board_masks); board and
+        previous_board are list-of-lists views built from those bitboards. Stones are also
+        joined into groups with a union-find over point indices, and every group root keeps
+        its stones, liberties and stone count so placements never flood fill the board.
+        zobrist_hash is updated with every stone change and position_history counts the
+        positions the game has passed through, which is what superko checks against.
+
         :param n: size of the board n*n
         """
         self.size = n
@@ -24,6 +97,102 @@ class GO:
         self.max_move = n * n - 1 # The max movement of a Go game
         self.komi = n/2 # Komi rule
         self.verbose = False # Verbose only when there is a manual player
+        self.full_mask, self.not_left, self.not_right, self.neighbor_masks, self.adjacent = board_masks(n)
+        self.zobrist = zobrist_keys(n)
+        self.superko = False # Forbid repeating any earlier position, not only the previous one
+        self.position_history = Counter() # Zobrist hash -> times the position started a turn
+        self.stones = [0, 0, 0] # Bitboards indexed by piece type, index 0 unused
+        self.previous_stones = [0, 0, 0]
+        self.build_groups()
+
+    @property
+    def board(self):
+        '''
+        Current board as a list of lists, built from the bitboards.
+
+        Writing into the returned lists does not change the game, use update_board instead.
+        '''
+        return self.bits_to_board(self.stones)
+
+    @board.setter
+    def board(self, board):
+        self.stones = self.board_to_bits(board)
+        self.build_groups()
+
+    @property
+    def previous_board(self):
+        '''
+        Previous board as a list of lists, built from the bitboards.
+        '''
+        return self.bits_to_board(self.previous_stones)
+
+    @previous_board.setter
+    def previous_board(self, board):
+        self.previous_stones = self.board_to_bits(board)
+
+    def board_to_bits(self, board):
+        '''
+        Convert a list-of-lists board into bitboards.
+
+        :param board: board state.
+        :return: list of bitboards indexed by piece type.
+        '''
+        stones = [0, 0, 0]
+        bit = 1
+        for row in board:
+            for cell in row:
+                if cell:
+                    stones[cell] |= bit
+                bit <<= 1
+        return stones
+
+    def bits_to_board(self, stones):
+        '''
+        Convert bitboards into a list-of-lists board.
+
+        :param stones: list of bitboards indexed by piece type.
+        :return: board state.
+        '''
+        n = self.size
+        black, white = stones[1], stones[2]
+        board = []
+        bit = 1
+        for i in range(n):
+            row = []
+            for j in range(n):
+                row.append(1 if black & bit else 2 if white & bit else 0)
+                bit <<= 1
+            board.append(row)
+        return board
+
+    def mask_to_positions(self, mask):
+        '''
+        List the positions set in a bitboard.
+
+        :param mask: bitboard.
+        :return: a list containing row and column (row, column) of each set bit, in row-major order.
+        '''
+        n = self.size
+        positions = []
+        while mask:
+            low = mask & -mask
+            positions.append(divmod(low.bit_length() - 1, n))
+            mask ^= low
+        return positions
+
+    def mask_to_indices(self, mask):
+        '''
+        List the point indices set in a bitboard.
+
+        :param mask: bitboard.
+        :return: a list containing the index i*n + j of each set bit, in row-major order.
+        '''
+        indices = []
+        while mask:
+            low = mask & -mask
+            indices.append(low.bit_length() - 1)
+            mask ^= low
+        return indices
 
     def init_board(self, n):
         '''
@@ -32,11 +201,13 @@ class GO:
         :param n: width and height of the board.
         :return: None.
         '''
-        board = [[0 for x in range(n)] for y in range(n)]  # Empty space marked as 0
+        # Empty space marked as 0
         # 'X' pieces marked as 1
         # 'O' pieces marked as 2
-        self.board = board
-        self.previous_board = deepcopy(board)
+        self.stones = [0, 0, 0]
+        self.previous_stones = [0, 0, 0]
+        self.position_history = Counter()
+        self.build_groups()
 
     def set_board(self, piece_type, previous_board, board):
         '''
@@ -48,15 +219,15 @@ class GO:
 
         # 'X' pieces marked as 1
         # 'O' pieces marked as 2
-
-        for i in range(self.size):
-            for j in range(self.size):
-                if previous_board[i][j] == piece_type and board[i][j] != piece_type:
-                    self.died_pieces.append((i, j))
+        previous_stones = self.board_to_bits(previous_board)
+        stones = self.board_to_bits(board)
+        self.died_pieces.extend(self.mask_to_positions(previous_stones[piece_type] & ~stones[piece_type]))
 
         # self.piece_type = piece_type
-        self.previous_board = previous_board
-        self.board = board
+        self.previous_stones = previous_stones
+        self.stones = stones
+        self.build_groups()
+        self.position_history[self.hash_stones(previous_stones)] += 1
 
     def compare_board(self, board1, board2):
         for i in range(self.size):
@@ -68,11 +239,196 @@ class GO:
     def copy_board(self):
         '''
         Copy the current board for potential testing.
+        Searches should prefer make_move and unmake_move, which only touch the changed points.
 
         :param: None.
         :return: the copied board instance.
         '''
-        return deepcopy(self)
+        new_go = copy(self)
+        new_go.stones = self.stones[:]
+        new_go.previous_stones = self.previous_stones[:]
+        new_go.died_pieces = self.died_pieces[:]
+        new_go.parent = self.parent[:]
+        new_go.group_stones = self.group_stones[:]
+        new_go.group_liberties = self.group_liberties[:]
+        new_go.group_size = self.group_size[:]
+        new_go.undo_log = self.undo_log[:]
+        new_go.position_history = self.position_history.copy()
+        return new_go
+
+    def hash_mask(self, mask, piece_type):
+        '''
+        Zobrist hash of the stones of one color.
+
+        :param mask: bitboard of the stones.
+        :param piece_type: 1('X') or 2('O').
+        :return: xor of the keys of every stone.
+        '''
+        keys = self.zobrist[piece_type]
+        value = 0
+        while mask:
+            low = mask & -mask
+            value ^= keys[low.bit_length() - 1]
+            mask ^= low
+        return value
+
+    def hash_stones(self, stones):
+        '''
+        Zobrist hash of a whole position.
+
+        :param stones: list of bitboards indexed by piece type.
+        :return: 64-bit position key.
+        '''
+        return self.hash_mask(stones[1], 1) ^ self.hash_mask(stones[2], 2)
+
+    def expand(self, mask):
+        '''
+        Grow a bitboard by one step in the four directions.
+
+        :param mask: bitboard.
+        :return: bitboard of mask plus all points adjacent to it.
+        '''
+        n = self.size
+        return (mask | ((mask << 1) & self.not_left) | ((mask >> 1) & self.not_right)
+                | (mask << n) | (mask >> n)) & self.full_mask
+
+    def flood_group(self, mask, color_mask):
+        '''
+        Flood fill the connected stones reachable from mask.
+
+        :param mask: bitboard of the seed stones.
+        :param color_mask: bitboard of the stones the fill may walk through.
+        :return: bitboard of the whole group.
+        '''
+        group = mask
+        while True:
+            grown = self.expand(group) & color_mask
+            if grown == group:
+                return group
+            group = grown
+
+    def build_groups(self):
+        '''
+        Rebuild the union-find groups from the bitboards.
+
+        Every group is flood filled once, its lowest point becomes the root and
+        all of its stones point straight at it. Moves recorded in the undo log refer
+        to the old tables, so the log is cleared too, and the Zobrist hash is recomputed.
+
+        :return: None.
+        '''
+        nn = self.size * self.size
+        self.parent = list(range(nn))
+        self.group_stones = [0] * nn # Bitboard of the group, valid at roots only
+        self.group_liberties = [0] * nn # Bitboard of the group liberties, valid at roots only
+        self.group_size = [0] * nn # Stone count of the group, valid at roots only
+        self.undo_log = [] # One record per make_move / make_pass, see unmake_move
+        self.zobrist_hash = self.hash_stones(self.stones)
+        empty = self.full_mask & ~(self.stones[1] | self.stones[2])
+        for piece_type in (1, 2):
+            color_mask = self.stones[piece_type]
+            remaining = color_mask
+            while remaining:
+                low = remaining & -remaining
+                root = low.bit_length() - 1
+                group = self.flood_group(low, color_mask)
+                members = group
+                while members:
+                    member = members & -members
+                    self.parent[member.bit_length() - 1] = root
+                    members ^= member
+                self.group_stones[root] = group
+                self.group_liberties[root] = self.expand(group) & empty
+                self.group_size[root] = popcount(group)
+                remaining &= ~group
+
+    def find(self, k):
+        '''
+        Find the root of the group holding a stone.
+
+        Groups are merged by size, so the walk is at most log2(n*n) steps.
+
+        :param k: index i*n + j of the stone.
+        :return: index of the group root.
+        '''
+        parent = self.parent
+        while parent[k] != k:
+            k = parent[k]
+        return k
+
+    def union(self, a, b):
+        '''
+        Merge two groups, attaching the smaller one under the larger one.
+
+        :param a: root of the first group.
+        :param b: root of the second group.
+        :return: root of the merged group.
+        '''
+        size = self.group_size
+        if size[a] < size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.group_stones[a] |= self.group_stones[b]
+        self.group_liberties[a] |= self.group_liberties[b]
+        size[a] += size[b]
+        return a
+
+    def add_stone(self, k, piece_type):
+        '''
+        Put a stone on an empty point and update only the groups next to it.
+
+        Opponent groups may be left without liberties, remove_died_pieces takes them off.
+
+        :param k: index i*n + j of the point.
+        :param piece_type: 1('X') or 2('O').
+        :return: None.
+        '''
+        point = 1 << k
+        stones = self.stones
+        stones[piece_type] |= point
+        self.zobrist_hash ^= self.zobrist[piece_type][k]
+        own = stones[piece_type]
+        opponent = stones[3 - piece_type]
+        liberties = self.group_liberties
+        self.parent[k] = k
+        self.group_stones[k] = point
+        self.group_size[k] = 1
+        liberties[k] = self.neighbor_masks[k] & ~(own | opponent)
+        root = k
+        for q in self.adjacent[k]:
+            if own >> q & 1:
+                other = self.find(q)
+                if other != root:
+                    root = self.union(root, other)
+            elif opponent >> q & 1:
+                liberties[self.find(q)] &= ~point
+        liberties[root] &= ~point
+
+    def remove_stones(self, mask):
+        '''
+        Take whole groups off the board and give their points back as liberties.
+
+        :param mask: bitboard of the stones to remove, made of complete groups.
+        :return: None.
+        '''
+        stones = self.stones
+        self.zobrist_hash ^= self.hash_mask(mask & stones[1], 1) ^ self.hash_mask(mask & stones[2], 2)
+        stones[1] &= ~mask
+        stones[2] &= ~mask
+        occupied = stones[1] | stones[2]
+        liberties = self.group_liberties
+        remaining = mask
+        while remaining:
+            low = remaining & -remaining
+            k = low.bit_length() - 1
+            for q in self.adjacent[k]:
+                if occupied >> q & 1:
+                    liberties[self.find(q)] |= low
+            self.parent[k] = k
+            self.group_stones[k] = 0
+            liberties[k] = 0
+            self.group_size[k] = 0
+            remaining ^= low
 
     def detect_neighbor(self, i, j):
         '''
@@ -82,13 +438,13 @@ class GO:
         :param j: column number of the board.
         :return: a list containing the neighbors row and column (row, column) of position (i, j).
         '''
-        board = self.board
+        n = self.size
         neighbors = []
         # Detect borders and add neighbor coordinates
         if i > 0: neighbors.append((i-1, j))
-        if i < len(board) - 1: neighbors.append((i+1, j))
+        if i < n - 1: neighbors.append((i+1, j))
         if j > 0: neighbors.append((i, j-1))
-        if j < len(board) - 1: neighbors.append((i, j+1))
+        if j < n - 1: neighbors.append((i, j+1))
         return neighbors
 
     def detect_neighbor_ally(self, i, j):
@@ -99,34 +455,26 @@ class GO:
         :param j: column number of the board.
         :return: a list containing the neighbored allies row and column (row, column) of position (i, j).
         '''
-        board = self.board
-        neighbors = self.detect_neighbor(i, j)  # Detect neighbors
-        group_allies = []
-        # Iterate through neighbors
-        for piece in neighbors:
-            # Add to allies list if having the same color
-            if board[piece[0]][piece[1]] == board[i][j]:
-                group_allies.append(piece)
-        return group_allies
+        k = i * self.size + j
+        point = 1 << k
+        color_mask = self.stones[1] if self.stones[1] & point else self.stones[2] if self.stones[2] & point \
+            else self.full_mask & ~(self.stones[1] | self.stones[2])
+        return self.mask_to_positions(self.neighbor_masks[k] & color_mask)
 
     def ally_dfs(self, i, j):
         '''
-        Using DFS to search for all allies of a given stone.
+        Flood fill all allies of a given stone.
 
         :param i: row number of the board.
         :param j: column number of the board.
         :return: a list containing the all allies row and column (row, column) of position (i, j).
         '''
-        stack = [(i, j)]  # stack for DFS serach
-        ally_members = []  # record allies positions during the search
-        while stack:
-            piece = stack.pop()
-            ally_members.append(piece)
-            neighbor_allies = self.detect_neighbor_ally(piece[0], piece[1])
-            for ally in neighbor_allies:
-                if ally not in stack and ally not in ally_members:
-                    stack.append(ally)
-        return ally_members
+        k = i * self.size + j
+        point = 1 << k
+        if (self.stones[1] | self.stones[2]) & point:
+            return self.mask_to_positions(self.group_stones[self.find(k)])
+        empty = self.full_mask & ~(self.stones[1] | self.stones[2])
+        return self.mask_to_positions(self.flood_group(point, empty))
 
     def find_liberty(self, i, j):
         '''
@@ -136,16 +484,8 @@ class GO:
         :param j: column number of the board.
         :return: boolean indicating whether the given stone still has liberty.
         '''
-        board = self.board
-        ally_members = self.ally_dfs(i, j)
-        for member in ally_members:
-            neighbors = self.detect_neighbor(member[0], member[1])
-            for piece in neighbors:
-                # If there is empty space around a piece, it has liberty
-                if board[piece[0]][piece[1]] == 0:
-                    return True
-        # If none of the pieces in a allied group has an empty space, it has no liberty
-        return False
+        # If there is empty space around the group, it has liberty
+        return self.group_liberties[self.find(i * self.size + j)] != 0
 
     def find_died_pieces(self, piece_type):
         '''
@@ -154,17 +494,15 @@ class GO:
         :param piece_type: 1('X') or 2('O').
         :return: a list containing the dead pieces row and column(row, column).
         '''
-        board = self.board
-        died_pieces = []
-
-        for i in range(len(board)):
-            for j in range(len(board)):
-                # Check if there is a piece at this position:
-                if board[i][j] == piece_type:
-                    # The piece die if it has no liberty
-                    if not self.find_liberty(i, j):
-                        died_pieces.append((i,j))
-        return died_pieces
+        died = 0
+        remaining = self.stones[piece_type]
+        while remaining:
+            root = self.find((remaining & -remaining).bit_length() - 1)
+            # The group die if it has no liberty
+            if not self.group_liberties[root]:
+                died |= self.group_stones[root]
+            remaining &= ~self.group_stones[root]
+        return self.mask_to_positions(died)
 
     def remove_died_pieces(self, piece_type):
         '''
@@ -186,10 +524,23 @@ class GO:
         :param positions: a list containing the pieces to be removed row and column(row, column)
         :return: None.
         '''
-        board = self.board
+        n = self.size
+        mask = 0
+        for piece in positions:
+            mask |= 1 << (piece[0] * n + piece[1])
+        mask &= self.stones[1] | self.stones[2]
+        groups = 0
         for piece in positions:
-            board[piece[0]][piece[1]] = 0
-        self.update_board(board)
+            k = piece[0] * n + piece[1]
+            if mask >> k & 1:
+                groups |= self.group_stones[self.find(k)]
+        if groups == mask:
+            self.remove_stones(mask)
+        else:
+            # Part of a group is removed, the remaining stones may split
+            self.stones[1] &= ~mask
+            self.stones[2] &= ~mask
+            self.build_groups()
 
     def place_chess(self, i, j, piece_type):
         '''
@@ -200,18 +551,107 @@ class GO:
         :param piece_type: 1('X') or 2('O').
         :return: boolean indicating whether the placement is valid.
         '''
-        board = self.board
-
         valid_place = self.valid_place_check(i, j, piece_type)
         if not valid_place:
             return False
-        self.previous_board = deepcopy(board)
-        board[i][j] = piece_type
-        self.update_board(board)
+        self.position_history[self.zobrist_hash] += 1
+        self.previous_stones = self.stones[:]
+        self.add_stone(i * self.size + j, piece_type)
         # Remove the following line for HW2 CS561 S2020
         # self.n_move += 1
         return True
 
+    def save_points(self, points):
+        '''
+        Snapshot the union-find entries of some points for the undo log.
+
+        :param points: indices i*n + j of the points about to change.
+        :return: a list of (index, parent, stones, liberties, size) tuples.
+        '''
+        return [(k, self.parent[k], self.group_stones[k], self.group_liberties[k], self.group_size[k])
+                for k in points]
+
+    def make_move(self, i, j, piece_type):
+        '''
+        Play one full turn and record how to take it back.
+
+        Places the stone, removes the opponent groups it captures and advances
+        previous_board, died_pieces, n_move and X_move like a turn of play does.
+        Only the entries of the changed points and their neighbor groups are saved,
+        so unmake_move restores the position in O(changes).
+
+        :param i: row number of the board.
+        :param j: column number of the board.
+        :param piece_type: 1('X') or 2('O').
+        :return: boolean indicating whether the move was valid. Nothing is recorded if not.
+        '''
+        if not self.valid_place_check(i, j, piece_type, test_check=True):
+            return False
+        k = i * self.size + j
+        stones = self.stones
+        occupied = stones[1] | stones[2]
+        saved = self.save_points([k] + [self.find(q) for q in self.adjacent[k] if occupied >> q & 1])
+        self.undo_log.append((stones[1], stones[2], self.zobrist_hash, self.previous_stones, self.died_pieces,
+                              self.n_move, self.X_move, saved))
+        self.position_history[self.zobrist_hash] += 1
+        self.previous_stones = stones[:]
+        self.add_stone(k, piece_type)
+
+        # Only the opponent groups next to the move can lose their last liberty
+        opponent = stones[3 - piece_type]
+        captured = 0
+        for q in self.adjacent[k]:
+            if opponent >> q & 1:
+                root = self.find(q)
+                if not self.group_liberties[root]:
+                    captured |= self.group_stones[root]
+        if captured:
+            points = self.mask_to_indices(captured)
+            occupied = (stones[1] | stones[2]) & ~captured
+            roots = [self.find(q) for p in points for q in self.adjacent[p] if occupied >> q & 1]
+            saved.extend(self.save_points(points + roots))
+            self.remove_stones(captured)
+        self.died_pieces = self.mask_to_positions(captured)
+        self.n_move += 1
+        self.X_move = not self.X_move
+        return True
+
+    def make_pass(self):
+        '''
+        Pass one turn and record how to take it back.
+
+        :return: None.
+        '''
+        stones = self.stones
+        self.undo_log.append((stones[1], stones[2], self.zobrist_hash, self.previous_stones, self.died_pieces,
+                              self.n_move, self.X_move, []))
+        self.position_history[self.zobrist_hash] += 1
+        self.previous_stones = stones[:]
+        self.n_move += 1
+        self.X_move = not self.X_move
+
+    def unmake_move(self):
+        '''
+        Take back the last turn recorded by make_move or make_pass.
+
+        :return: None.
+        '''
+        black, white, self.zobrist_hash, self.previous_stones, self.died_pieces, self.n_move, self.X_move, saved \
+            = self.undo_log.pop()
+        self.stones[1] = black
+        self.stones[2] = white
+        history = self.position_history
+        history[self.zobrist_hash] -= 1
+        if not history[self.zobrist_hash]:
+            del history[self.zobrist_hash]
+        parent, group_stones, liberties, size = self.parent, self.group_stones, self.group_liberties, self.group_size
+        # Restore newest first, so a point saved twice ends with its oldest value
+        for k, k_parent, k_stones, k_liberties, k_size in reversed(saved):
+            parent[k] = k_parent
+            group_stones[k] = k_stones
+            liberties[k] = k_liberties
+            size[k] = k_size
+
     def valid_place_check(self, i, j, piece_type, test_check=False):
         '''
         Check whether a placement is valid.
@@ -222,49 +662,64 @@ class GO:
         :param test_check: boolean if it's a test check.
         :return: boolean indicating whether the placement is valid.
         '''   
-        board = self.board
+        n = self.size
         verbose = self.verbose
         if test_check:
             verbose = False
 
         # Check if the place is in the board range
-        if not (i >= 0 and i < len(board)):
+        if not (i >= 0 and i < n):
             if verbose:
-                print(('Invalid placement. row should be in the range 1 to {}.').format(len(board) - 1))
+                print(('Invalid placement. row should be in the range 1 to {}.').format(n - 1))
             return False
-        if not (j >= 0 and j < len(board)):
+        if not (j >= 0 and j < n):
             if verbose:
-                print(('Invalid placement. column should be in the range 1 to {}.').format(len(board) - 1))
+                print(('Invalid placement. column should be in the range 1 to {}.').format(n - 1))
             return False
         
         # Check if the place already has a piece
-        if board[i][j] != 0:
+        k = i * n + j
+        point = 1 << k
+        own = self.stones[piece_type]
+        opponent = self.stones[3 - piece_type]
+        if (own | opponent) & point:
             if verbose:
                 print('Invalid placement. There is already a chess in this position.')
             return False
-        
-        # Copy the board for testing
-        test_go = self.copy_board()
-        test_board = test_go.board
-
-        # Check if the place has liberty
-        test_board[i][j] = piece_type
-        test_go.update_board(test_board)
-        if test_go.find_liberty(i, j):
-            return True
 
-        # If not, remove the died pieces of opponent and check again
-        test_go.remove_died_pieces(3 - piece_type)
-        if not test_go.find_liberty(i, j):
+        # Check if the place has liberty, joining the liberties of the allied groups next to it
+        liberties = self.neighbor_masks[k] & ~(own | opponent)
+        captured = 0
+        for q in self.adjacent[k]:
+            if own >> q & 1:
+                liberties |= self.group_liberties[self.find(q)]
+            elif opponent >> q & 1:
+                root = self.find(q)
+                if self.group_liberties[root] == point:
+                    captured |= self.group_stones[root]
+        if liberties & ~point:
+            if not self.superko:
+                return True
+
+        # If not, the opponent groups whose last liberty is this place die and free it
+        elif not captured:
             if verbose:
                 print('Invalid placement. No liberty found in this position.')
             return False
 
         # Check special case: repeat placement causing the repeat board state (KO rule)
-        else:
-            if self.died_pieces and self.compare_board(self.previous_board, test_go.board):
+        elif self.died_pieces and self.previous_stones[piece_type] == own | point \
+                and self.previous_stones[3 - piece_type] == opponent & ~captured:
+            if verbose:
+                print('Invalid placement. A repeat move not permitted by the KO rule.')
+            return False
+
+        # Positional superko: no position of the game may come back
+        if self.superko:
+            position = self.zobrist_hash ^ self.zobrist[piece_type][k] ^ self.hash_mask(captured, 3 - piece_type)
+            if self.position_history[position]:
                 if verbose:
-                    print('Invalid placement. A repeat move not permitted by the KO rule.')
+                    print('Invalid placement. A repeat position not permitted by the superko rule.')
                 return False
         return True
         
@@ -310,7 +765,7 @@ class GO:
         if self.n_move >= self.max_move:
             return True
         # Case 2: two players all pass the move.
-        if self.compare_board(self.previous_board, self.board) and action == "PASS":
+        if self.previous_stones == self.stones and action == "PASS":
             return True
         return False
 
@@ -322,13 +777,7 @@ class GO:
         :return: boolean indicating whether the game should end.
         '''
 
-        board = self.board
-        cnt = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                if board[i][j] == piece_type:
-                    cnt += 1
-        return cnt          
+        return popcount(self.stones[piece_type])
 
     def judge_winner(self):
         '''
@@ -398,7 +847,8 @@ class GO:
 
                 self.died_pieces = self.remove_died_pieces(3 - piece_type) # Remove the dead pieces of opponent
             else:
-                self.previous_board = deepcopy(self.board)
+                self.position_history[self.zobrist_hash] += 1
+                self.previous_stones = self.stones[:]
 
             if verbose:
                 self.visualize_board() # Visualize the board again
@@ -1,5 +1,6 @@
 import copy
 import random
+import sys
 from read import readInput
 from write import writeOutput
 
@@ -145,10 +146,7 @@ def max_play(curr_state, prev_state, depth, alpha, beta, player):
             beta = best
     return best
 
-# === Main Execution ===
-if __name__ == '__main__':
-    color, prev_board, curr_board = readInput(BOARD_SIZE)
-
+def get_move(color, prev_board, curr_board):
     checker = 0
     center_occupied = False
     for i in range(BOARD_SIZE):
@@ -159,9 +157,16 @@ if __name__ == '__main__':
                 checker += 1
 
     if (checker == 0 and color == 1) or (checker == 1 and color == 2 and not center_occupied):
-        action = (2, 2)
-    else:
-        actions = minimax(curr_board, prev_board, 2, -float('inf'), -float('inf'), color)
-        action = random.choice(actions) if actions else 'PASS'
+        return (2, 2)
+    actions = minimax(curr_board, prev_board, 2, -float('inf'), -float('inf'), color)
+    return random.choice(actions) if actions else 'PASS'
 
-    writeOutput(action)
+# === Main Execution ===
+if __name__ == '__main__':
+    if '--worker' in sys.argv:
+        # 仅 worker 模式需要 player_worker，文件模式仍可单独提交本脚本
+        from player_worker import serve
+        serve(get_move)
+    else:
+        color, prev_board, curr_board = readInput(BOARD_SIZE)
+        writeOutput(get_move(color, prev_board, curr_board))
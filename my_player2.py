@@ -1,10 +1,24 @@
+import atexit
 import copy
+import math
+import multiprocessing
 import random
 import time
+import sys
+import numpy as np
 from read import readInput
 from write import writeOutput
 
 BOARD_SIZE = 5
+KOMI = BOARD_SIZE / 2  # 白方贴目，与 host.py 相同
+MAX_MOVES = BOARD_SIZE * BOARD_SIZE - 1  # host.py 的每局手数上限
+# 展平棋盘上每个点的上下左右邻点
+NEIGHBORS = [tuple(x * BOARD_SIZE + y for x, y in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                   if 0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE)
+             for i in range(BOARD_SIZE) for j in range(BOARD_SIZE)]
+ROLLOUT_BATCH = None  # 每个叶子一次批量模拟的盘数（如 256），None 表示逐盘模拟
+PROCESSES = 1  # 根并行的进程数，命令行 --processes N；进程池在同一进程的各步之间复用
+VERBOSE = False  # 命令行加 --verbose 时报告每步的模拟次数
 
 class GoGame:
     def __init__(self, board, prev_board, piece_type):
@@ -86,49 +100,409 @@ class GoGame:
         score = black - white
         return score if player == 1 else -score
 
-class MCTS:
+class Playout:
+    # 模拟用的快速棋盘：展平数组、空点表、访问标记和栈都预先分配，每步只检查落子点周围，不新建对象
+    __slots__ = ('board', 'empties', 'empty_pos', 'empty_count', 'ko', 'mark', 'stamp', 'stack')
+
     def __init__(self):
-        pass
+        n = BOARD_SIZE * BOARD_SIZE
+        self.board = [0] * n
+        self.empties = [0] * n  # 前 empty_count 项是当前的空点
+        self.empty_pos = [0] * n  # 空点在 empties 中的位置
+        self.empty_count = 0
+        self.ko = -1  # 下一手不能落的劫点，-1 表示没有
+        self.mark = [0] * n  # 棋块搜索的访问标记，每次搜索换一个 stamp，不必清零
+        self.stamp = 0
+        self.stack = [0] * n
 
-    def get_best_move(self, state):
-        start_time = time.time()
+    def load(self, board, ko):
+        self.empty_count = 0
+        for p in range(len(board)):
+            self.board[p] = board[p]
+            if board[p] == 0:
+                self.add_empty(p)
+        self.ko = ko
+
+    def add_empty(self, p):
+        self.empties[self.empty_count] = p
+        self.empty_pos[p] = self.empty_count
+        self.empty_count += 1
+
+    def remove_empty(self, p):
+        i = self.empty_pos[p]
+        self.empty_count -= 1
+        last = self.empties[self.empty_count]
+        self.empties[i] = last
+        self.empty_pos[last] = i
+
+    def liberties(self, p, limit):
+        # p 所在棋块的气数，数到 limit 就停
+        board, mark, stack = self.board, self.mark, self.stack
+        self.stamp += 1
+        stamp = self.stamp
+        color = board[p]
+        mark[p] = stamp
+        stack[0] = p
+        top, count = 1, 0
+        while top:
+            top -= 1
+            for q in NEIGHBORS[stack[top]]:
+                if mark[q] == stamp:
+                    continue
+                if board[q] == 0:
+                    mark[q] = stamp
+                    count += 1
+                    if count >= limit:
+                        return count
+                elif board[q] == color:
+                    mark[q] = stamp
+                    stack[top] = q
+                    top += 1
+        return count
+
+    def remove_group(self, p):
+        # 提掉 p 所在棋块，返回提子数
+        board, stack = self.board, self.stack
+        color = board[p]
+        board[p] = 0
+        self.add_empty(p)
+        stack[0] = p
+        top, count = 1, 1
+        while top:
+            top -= 1
+            for q in NEIGHBORS[stack[top]]:
+                if board[q] == color:
+                    board[q] = 0
+                    self.add_empty(q)
+                    stack[top] = q
+                    top += 1
+                    count += 1
+        return count
+
+    def is_legal(self, p, color):
+        # p 为空点：有空邻点、连上还有别的气的己方棋块、或能提掉只剩这一气的对方棋块时合法
+        if p == self.ko:
+            return False
+        board = self.board
+        for q in NEIGHBORS[p]:
+            if board[q] == 0:
+                return True
+        for q in NEIGHBORS[p]:
+            if board[q] == color:
+                if self.liberties(q, 2) > 1:
+                    return True
+            elif self.liberties(q, 2) == 1:
+                return True
+        return False
+
+    def is_eye(self, p, color):
+        for q in NEIGHBORS[p]:
+            if self.board[q] != color:
+                return False
+        return True
+
+    def legal_moves(self, color):
+        return [p for p in self.empties[:self.empty_count] if self.is_legal(p, color)]
+
+    def play(self, p, color):
+        board = self.board
+        board[p] = color
+        self.remove_empty(p)
+        other = 3 - color
+        captured, last, lone = 0, -1, True
+        for q in NEIGHBORS[p]:
+            if board[q] == other and self.liberties(q, 1) == 0:
+                captured += self.remove_group(q)
+                last = q
+            elif board[q] == color:
+                lone = False
+        # 只提一子，且落下的是只剩一气的单子时，对方不能立即在原处提回
+        self.ko = last if captured == 1 and lone and self.liberties(p, 2) == 1 else -1
+
+    def random_move(self, color):
+        # 从随机位置起找第一个合法、且不填自己眼的空点，没有时返回 -1（停一手）
+        count = self.empty_count
+        if count == 0:
+            return -1
+        start = random.randrange(count)
+        for k in range(count):
+            p = self.empties[(start + k) % count]
+            if not self.is_eye(p, color) and self.is_legal(p, color):
+                return p
+        return -1
+
+    def rollout(self, color, passes, moves_left):
+        # 双方随机落子，直到连续两次停一手或手数用完，黑方贴目后胜返回 1
+        while moves_left > 0 and passes < 2:
+            p = self.random_move(color)
+            if p < 0:
+                passes += 1
+                self.ko = -1
+            else:
+                passes = 0
+                self.play(p, color)
+            color = 3 - color
+            moves_left -= 1
+        return 1 if self.board.count(1) - self.board.count(2) > KOMI else 0
+
+class BatchPlayout:
+    # 批量模拟：size 盘从同一局面出发的对局同步推进。每盘的黑、白子各压成一个 25 位整数，
+    # 一批对局就是长度为 size 的 uint32 数组，选点、提子、计分都是整批的数组运算
+    # 各盘每一步都轮到同一方（停一手也算一步），所以只需按“走棋方 / 对方”两组子交替
+    def __init__(self, size):
+        n = BOARD_SIZE
+        nn = n * n
+        self.size = size
+        self.full = np.uint32((1 << nn) - 1)
+        self.not_left = np.uint32(sum(1 << p for p in range(nn) if p % n != 0))  # 去掉第一列
+        self.not_right = np.uint32(sum(1 << p for p in range(nn) if p % n != n - 1))  # 去掉最后一列
+        self.bits = np.uint32(1) << np.arange(nn, dtype=np.uint32)
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+    def shifts(self, x):
+        # x 中各子分别向上、下、左、右移一格
+        n = BOARD_SIZE
+        return x >> n, (x << n) & self.full, (x & self.not_left) >> 1, (x & self.not_right) << 1
+
+    def expand(self, x):
+        up, down, left, right = self.shifts(x)
+        return up | down | left | right
+
+    def flood(self, seed, stones):
+        # 从 seed 出发、由 stones 中的子连成的棋块
+        group = seed
+        while True:
+            grown = (group | self.expand(group)) & stones
+            if np.array_equal(grown, group):
+                return group
+            group = grown
+
+    def count(self, x):
+        return ((x[:, None] & self.bits) != 0).sum(axis=1)
+
+    def step(self, own, opp, ko, passes):
+        # 走棋方在还没结束的各盘随机落一子，返回新的 (own, opp, ko, passes)
+        # 先随机挑一个不是劫点、不填自己眼的空点，再检查它是否自杀，不合法就从候选中去掉重挑，挑完仍没有就停一手
+        empty = ~(own | opp) & self.full
+        eyes = empty & ~self.expand(empty | opp)
+        candidates = np.where(passes < 2, empty & ~eyes & ~ko, np.uint32(0))
+        move = np.zeros_like(own)
+        captured = np.zeros_like(own)
+        new_ko = np.zeros_like(own)
+        pending = np.flatnonzero(candidates)
+        while len(pending):
+            choices = (candidates[pending, None] & self.bits) != 0
+            stone = self.bits[np.where(choices, self.rng.random(choices.shape), -1).argmax(axis=1)]
+            space = empty[pending] & ~stone
+            enemies = opp[pending]
+            taken = np.zeros_like(stone)
+            for seed in self.shifts(stone):
+                group = self.flood(seed & enemies, enemies)
+                taken |= np.where(self.expand(group) & space, np.uint32(0), group)
+            group = self.flood(stone, own[pending] | stone)
+            liberties = self.expand(group) & (space | taken)
+            legal = liberties != 0
+            done = pending[legal]
+            move[done] = stone[legal]
+            captured[done] = taken[legal]
+            # 只提一子、落下的是只剩一气的单子时成劫，劫点就是被提的那一点
+            single = (taken & (taken - 1) == 0) & (taken != 0) & (group == stone) & (liberties & (liberties - 1) == 0)
+            new_ko[done] = np.where(single, taken, np.uint32(0))[legal]
+            retry = pending[~legal]
+            candidates[retry] &= ~stone[~legal]
+            pending = retry[candidates[retry] != 0]
+        moved = move != 0
+        passes = np.where(moved, 0, np.where(passes < 2, passes + 1, passes))
+        return own | move, opp & ~captured, new_ko, passes
+
+    def rollout(self, board, ko, color, passes, moves_left):
+        # 从同一局面随机下 size 盘到终局，返回黑方贴目后获胜的盘数
+        black = np.uint32(sum(1 << p for p, v in enumerate(board) if v == 1))
+        white = np.uint32(sum(1 << p for p, v in enumerate(board) if v == 2))
+        own = np.full(self.size, black if color == 1 else white, dtype=np.uint32)
+        opp = np.full(self.size, white if color == 1 else black, dtype=np.uint32)
+        ko = np.full(self.size, 1 << ko if ko >= 0 else 0, dtype=np.uint32)
+        passes = np.full(self.size, passes)
+        for _ in range(moves_left):
+            if (passes >= 2).all():
+                break
+            own, opp, ko, passes = self.step(own, opp, ko, passes)
+            own, opp = opp, own
+            color = 3 - color
+        black, white = (own, opp) if color == 1 else (opp, own)
+        return int((self.count(black) - self.count(white) > KOMI).sum())
+
+def find_ko(board, prev_board, color):
+    # 对方上一手只提掉 color 的一个子、且落下的是只剩一气的单子时，被提的点就是劫点
+    n = BOARD_SIZE * BOARD_SIZE
+    flat = [v for row in board for v in row]
+    prev = [v for row in prev_board for v in row]
+    taken = [p for p in range(n) if prev[p] == color and flat[p] == 0]
+    placed = [p for p in range(n) if prev[p] == 0 and flat[p] == 3 - color]
+    if len(taken) != 1 or len(placed) != 1:
+        return -1
+    m = placed[0]
+    if taken[0] not in NEIGHBORS[m]:
+        return -1
+    for q in NEIGHBORS[m]:
+        if q != taken[0] and flat[q] != color:
+            return -1
+    return taken[0]
+
+class Node:
+    # 搜索树节点，保存走完 move 之后的局面；move 是点下标，-1 表示停一手
+    # color 是轮到走的一方，wins 从走出 move 的一方（3 - color）看
+    __slots__ = ('board', 'ko', 'color', 'passes', 'moves_left', 'parent', 'move', 'children', 'untried',
+                 'visits', 'wins')
+
+    def __init__(self, board, ko, color, passes, moves_left, untried, parent=None, move=None):
+        self.board = board
+        self.ko = ko
+        self.color = color
+        self.passes = passes
+        self.moves_left = moves_left
+        self.parent = parent
+        self.move = move
+        self.children = []
+        # 连续两次停一手或手数用完时对局结束，不再展开
+        self.untried = untried if passes < 2 and moves_left > 0 else []
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        # UCB1：平均胜率加探索项
+        log_n = math.log(self.visits)
+        return max(self.children, key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_n / c.visits))
+
+class MCTS:
+    def __init__(self, time_limit=0.9, max_playouts=None, exploration=1.4, rollout_depth=None, batch_size=None,
+                 processes=1, verbose=False):
+        self.time_limit = time_limit  # 每步秒数
+        self.max_playouts = max_playouts  # 模拟次数上限（各进程合计），None 表示只按时间
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth  # 每次模拟最多走几步，None 表示下到终局
+        self.batch_size = batch_size  # 给出时每个叶子批量模拟这么多盘
+        self.processes = processes  # 根并行的进程数，1 表示在本进程里搜索
+        self.verbose = verbose  # 为 True 时把模拟次数和每秒模拟数打印到 stderr
+        self.engine = Playout()
+        self.batch = BatchPlayout(batch_size) if batch_size else None
+        self.playouts = 0
+        self.elapsed = 0.0
+
+    def search(self, state, deadline):
+        # 在 deadline 之前从 state 生长一棵树，返回根节点各子节点的 (着法, 访问次数, 走棋方的胜局数)
+        # 根节点的合法着法用 GoGame 按 host.py 的规则逐点判断，树内和模拟都在 Playout 上进行
         legal_moves = state.get_legal_moves()
+        board = tuple(v for row in state.board for v in row)
+        # host.py 在 MAX_MOVES 手后结束对局，已下手数按盘上子数估计
+        moves_left = MAX_MOVES - sum(1 for v in board if v != 0)
+        root = Node(board, find_ko(state.board, state.prev_board, state.piece_type), state.piece_type, 0,
+                    max(moves_left, 1), [i * BOARD_SIZE + j for i, j in legal_moves])
+
+        engine = self.engine
+        self.playouts = 0
+        while time.time() < deadline:
+            if self.max_playouts is not None and self.playouts >= self.max_playouts:
+                break
+            # 选择：沿 UCB1 最大的子节点走到还有未展开着法的节点
+            node = root
+            while not node.untried and node.children:
+                node = node.select_child(self.exploration)
+            engine.load(node.board, node.ko)
+            color, passes, moves_left = node.color, node.passes, node.moves_left
+            # 展开一个新子节点
+            if node.untried:
+                move = node.untried.pop(random.randrange(len(node.untried)))
+                if move < 0:
+                    passes += 1
+                    engine.ko = -1
+                else:
+                    passes = 0
+                    engine.play(move, color)
+                color = 3 - color
+                moves_left -= 1
+                child = Node(tuple(engine.board), engine.ko, color, passes, moves_left,
+                             engine.legal_moves(color) or [-1], node, move)
+                node.children.append(child)
+                node = child
+            # 从新节点接着模拟，然后回传黑方的胜局数
+            if self.rollout_depth is not None:
+                moves_left = min(moves_left, self.rollout_depth)
+            if self.batch is not None:
+                played, wins = self.batch.size, self.batch.rollout(node.board, node.ko, color, passes, moves_left)
+            else:
+                played, wins = 1, engine.rollout(color, passes, moves_left)
+            while node is not None:
+                node.visits += played
+                node.wins += wins if node.color == 2 else played - wins
+                node = node.parent
+            self.playouts += played
+        return [(c.move, c.visits, c.wins) for c in root.children]
 
-        if legal_moves == ["PASS"]:
+    def get_best_move(self, state):
+        start_time = time.time()
+        if state.get_legal_moves() == ["PASS"]:
             return "PASS"
+        deadline = start_time + self.time_limit
+        if self.processes > 1:
+            # 根并行：各进程从同一根节点各自建树，合并根节点的访问次数和胜局数后再选
+            settings = (self.time_limit, self.max_playouts and -(-self.max_playouts // self.processes),
+                        self.exploration, self.rollout_depth, self.batch_size)
+            tasks = [(settings, (state.board, state.prev_board, state.piece_type), deadline, random.getrandbits(64))
+                     for _ in range(self.processes)]
+            results = get_pool(self.processes).map(search_worker, tasks)
+            stats = {}
+            for children, _ in results:
+                for move, visits, wins in children:
+                    total = stats.setdefault(move, [0, 0.0])
+                    total[0] += visits
+                    total[1] += wins
+            self.playouts = sum(playouts for _, playouts in results)
+        else:
+            stats = {move: (visits, wins) for move, visits, wins in self.search(state, deadline)}
 
-        move_scores = {move: 0 for move in legal_moves}
-        move_counts = {move: 0 for move in legal_moves}
-
-        move_index = 0
-        num_moves = len(legal_moves)
-
-        while time.time() - start_time < 0.9:
-            move = legal_moves[move_index]
-            next_state = state.do_move(move)
-            result = self.simulate(next_state, state.piece_type)
-            move_scores[move] += result
-            move_counts[move] += 1
-
-            move_index = (move_index + 1) % num_moves  
-            
-        best_move = max(move_scores.items(), key=lambda x: x[1] / move_counts[x[0]])[0]
-        return best_move
-
-    def simulate(self, state, player):
-        curr_state = state
-        for _ in range(5):
-            legal_moves = curr_state.get_legal_moves()
-            if legal_moves == ["PASS"]:
-                break
-            move = random.choice(legal_moves)
-            curr_state = curr_state.do_move(move)
-        return curr_state.evaluate(player)
+        self.elapsed = time.time() - start_time
+        if self.verbose:
+            print(f"playouts: {self.playouts}, {self.playouts / self.elapsed:.0f}/s", file=sys.stderr)
+        # 时限内一个子节点都没展开（时限极短，或进程池启动占掉了时间）时随机走一步合法着法
+        visited = [move for move in stats if stats[move][0] > 0]
+        if not visited:
+            return random.choice(state.get_legal_moves())
+        best = max(visited, key=lambda move: stats[move][0])
+        return divmod(best, BOARD_SIZE)
 
 
-if __name__ == '__main__':
-    piece_type, prev_board, curr_board = readInput(BOARD_SIZE)
+_pools = {}  # 进程数 -> 进程池，同一进程里的各步（各局）共用，不必每步重新启动
+
+def get_pool(processes):
+    if processes not in _pools:
+        _pools[processes] = multiprocessing.Pool(processes)
+        atexit.register(_pools[processes].terminate)
+    return _pools[processes]
+
+def search_worker(task):
+    # 进程池中执行：按给定设置和种子搜一棵树，返回 (根节点子节点统计, 模拟次数)
+    settings, (board, prev_board, piece_type), deadline, seed = task
+    random.seed(seed)
+    agent = MCTS(*settings)
+    children = agent.search(GoGame(board, prev_board, piece_type), deadline)
+    return children, agent.playouts
+
+
+def get_move(piece_type, prev_board, curr_board):
     state = GoGame(curr_board, prev_board, piece_type)
-    agent = MCTS()
-    move = agent.get_best_move(state)
-    writeOutput(move)
+    agent = MCTS(batch_size=ROLLOUT_BATCH, processes=PROCESSES, verbose=VERBOSE)
+    return agent.get_best_move(state)
+
+
+if __name__ == '__main__':
+    VERBOSE = '--verbose' in sys.argv
+    if '--processes' in sys.argv:
+        PROCESSES = int(sys.argv[sys.argv.index('--processes') + 1])
+    if '--worker' in sys.argv:
+        # 仅 worker 模式需要 player_worker
+        from player_worker import serve
+        serve(get_move)
+    else:
+        piece_type, prev_board, curr_board = readInput(BOARD_SIZE)
+        writeOutput(get_move(piece_type, prev_board, curr_board))
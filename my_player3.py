@@ -1,13 +1,128 @@
+import atexit
+import multiprocessing
+import os
 import random
+import struct
+import tempfile
 import numpy as np
+import sys
+import time
+from collections import OrderedDict
 from read import readInput
 from write import writeOutput
 
+TIME_LIMIT = 0.7  # 每步搜索时限（秒）：每步实际约 1 秒，留出解释器启动、导入 numpy 和读写文件的余量
+MAX_DEPTH = 25  # 迭代加深的深度上限，5x5 棋盘上实际由时限决定
+SEARCH_CACHE = None  # 跨步保留置换表的缓存文件，如 "my_player3.cache"；None 表示每步重新开始
+PROCESSES = 1  # Lazy SMP 的搜索进程数（含本进程），命令行 --processes N；进程池在同一进程的各步之间复用
+# build_book.py 生成的开局库；文件不存在时照常搜索
+OPENING_BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+# build_tablebase.py 生成的残局库；文件不存在时照常搜索
+ENDGAME_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endgame_table.bin')
+SOLVER_EMPTY = 10  # 空点少于这个数时先用证明数搜索求终局胜负
+SOLVER_TIME = 0.3  # 证明数搜索的时限（秒），不超过 TIME_LIMIT 的剩余时间；证不出时剩下的时间交给 MiniMaxAI
+
+class PositionAnalysis:
+    # 一个局面的棋块分析，每个搜索节点只建一次，评估、提子和合法性判断共用
+    def __init__(self, game, board):
+        nn = game.BOARD_SIZE * game.BOARD_SIZE
+        # flat: 末尾补棋盘外哨兵(-1)的展平棋盘；labels: 每点所属棋块的标号；liberties: 按标号索引的气数
+        self.flat, self.labels, self.liberties = game.label_groups(board)
+        self.stone_liberties = np.where(self.flat[:nn] > 0, self.liberties[self.labels[:nn]], 0)
+        roots = np.flatnonzero(self.labels[:nn] == np.arange(nn))
+        # 被叫吃（只剩一气）的棋块标号，按颜色分开
+        self.atari = {color: roots[(self.flat[roots] == color) & (self.liberties[roots] == 1)] for color in (1, 2)}
+
+    def captured_mask(self, color):
+        # color 方已经没有气的子
+        nn = len(self.stone_liberties)
+        return (self.flat[:nn] == color) & (self.stone_liberties == 0)
+
 class GoGame:
-    def __init__(self, board_size=5):
+    def __init__(self, board_size=5, analysis_capacity=8192):
         self.BOARD_SIZE = board_size
         self.board = np.zeros((board_size, board_size), dtype=int)
         self.prev_board = np.copy(self.board)
+        self.neighbor_index = self.build_neighbor_index()
+        self.zobrist, self.zobrist_side = self.build_zobrist_keys()
+        self.symmetries, self.inverse_symmetries = self.build_symmetries()
+        self.zobrist_moves_left, self.zobrist_passes = self.build_state_keys()
+        self.analysis_cache = OrderedDict()  # 局面字节 -> PositionAnalysis，按最近使用淘汰
+        self.analysis_capacity = analysis_capacity
+
+    def analyze(self, board):
+        key = board.tobytes()
+        analysis = self.analysis_cache.get(key)
+        if analysis is not None:
+            self.analysis_cache.move_to_end(key)
+            return analysis
+        analysis = PositionAnalysis(self, board)
+        self.analysis_cache[key] = analysis
+        if len(self.analysis_cache) > self.analysis_capacity:
+            self.analysis_cache.popitem(last=False)
+        return analysis
+
+    def build_neighbor_index(self):
+        # 展平棋盘后每个点的上下左右下标，棋盘外用哨兵下标 N*N 表示
+        n = self.BOARD_SIZE
+        index = np.full((n * n, 4), n * n, dtype=np.intp)
+        for i, j in np.ndindex(n, n):
+            for d, (x, y) in enumerate(((i-1, j), (i+1, j), (i, j-1), (i, j+1))):
+                if 0 <= x < n and 0 <= y < n:
+                    index[i * n + j, d] = x * n + y
+        return index
+
+    def build_zobrist_keys(self):
+        # 每种颜色、每个点一个 64 位随机数（空点为 0），另加一个轮到白方时异或的键
+        # 按棋盘大小固定种子，不同进程算出的哈希相同
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        rng = np.random.RandomState(nn)
+        keys = np.zeros((3, nn), dtype=np.uint64)
+        keys[1:] = rng.randint(0, 2**64, size=(2, nn), dtype=np.uint64)
+        return keys, int(rng.randint(0, 2**64, dtype=np.uint64))
+
+    def board_hash(self, board, color):
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        key = int(np.bitwise_xor.reduce(self.zobrist[board.ravel(), np.arange(nn)]))
+        return key ^ self.zobrist_side if color == 2 else key
+
+    def build_symmetries(self):
+        # 8 种旋转、翻转的下标置换：变换 t 后的展平棋盘是 flat[symmetries[t]]
+        # 原棋盘上的点 k 变换后落在 inverse[t][k]
+        n = self.BOARD_SIZE
+        index = np.arange(n * n).reshape(n, n)
+        symmetries = np.array([np.rot90(grid, k).ravel() for grid in (index, index.T) for k in range(4)])
+        return symmetries, np.argsort(symmetries, axis=1)
+
+    def canonical_hash(self, board, color):
+        # 8 个对称局面中哈希最小的作为代表，返回 (键, 变换下标)
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        keys = np.bitwise_xor.reduce(self.zobrist[board.ravel()[self.symmetries], np.arange(nn)], axis=1)
+        t = int(np.argmin(keys))
+        key = int(keys[t])
+        return (key ^ self.zobrist_side if color == 2 else key), t
+
+    def build_state_keys(self):
+        # 残局库的键还要区分到手数上限剩余的手数和连续停一手的次数；换一个种子，不影响已有的局面键
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        keys = np.random.RandomState(nn + 1).randint(0, 2**64, size=nn + 1, dtype=np.uint64)
+        return [int(k) for k in keys[:nn]], [0, int(keys[nn])]
+
+    def ko_restricted(self, board, prev_board, player):
+        # 上一局面是否还限制着 player 的着法：只有上一手恰好提掉一子时才可能打劫
+        prev = np.asarray(prev_board)
+        if np.count_nonzero(board) != np.count_nonzero(prev) or np.array_equal(board, prev):
+            return False
+        return not np.array_equal(self.legal_move_mask(board, prev, player, fill_eyes=True),
+                                  self.legal_move_mask(board, board, player, fill_eyes=True))
+
+    def state_hash(self, board, prev_board, color, moves_left, passes):
+        # 残局库的键：规范局面键再异或剩余手数和停一手次数的键，返回 (键, 变换下标)
+        # 打劫时结果还取决于上一局面，这类局面不进残局库，返回 None
+        if self.ko_restricted(board, prev_board, color):
+            return None
+        key, t = self.canonical_hash(board, color)
+        return key ^ self.zobrist_moves_left[moves_left] ^ self.zobrist_passes[passes], t
 
     def load_boards(self, color, prev_board, curr_board):
         self.color = color
@@ -33,25 +148,11 @@ class GoGame:
         return list(group)
 
     def count_group_liberties(self, board, row, col):
-        group = self.get_friendly_group(board, row, col)
-        liberties = set()
-        for point in group:
-            for neighbor in self.get_neighbors(point[0], point[1]):
-                if board[neighbor[0], neighbor[1]] == 0:
-                    liberties.add(neighbor)
-        return len(liberties)
+        return int(self.analyze(board).stone_liberties[row * self.BOARD_SIZE + col])
 
     def get_captured_stones(self, board, color):
-        captured = []
-        visited = np.zeros_like(board, dtype=bool)
-        for i, j in np.ndindex(self.BOARD_SIZE, self.BOARD_SIZE):
-            if board[i, j] == color and not visited[i, j]:
-                group = self.get_friendly_group(board, i, j)
-                for x, y in group:
-                    visited[x, y] = True
-                if self.count_group_liberties(board, i, j) == 0:
-                    captured.extend(group)
-        return captured
+        n = self.BOARD_SIZE
+        return [divmod(int(k), n) for k in np.flatnonzero(self.analyze(board).captured_mask(color))]
 
     def clear_stones(self, board, stones):
         for x, y in stones:
@@ -59,26 +160,16 @@ class GoGame:
         return board
 
     def clear_captured_stones(self, board, color):
-        captured = self.get_captured_stones(board, color)
-        return self.clear_stones(board, captured) if captured else board
+        captured = self.analyze(board).captured_mask(color)
+        if captured.any():
+            board.ravel()[captured] = 0
+        return board
 
     def is_ko_violation(self, prev_board, board):
         return np.array_equal(prev_board, board)
 
     def is_legal_action(self, board, prev_board, player, i, j):
-        if board[i, j] != 0:
-            return False
-
-        if self.is_eye(board, i, j, player):
-            return False
-
-        next_board = np.copy(board)
-        next_board[i, j] = player
-        next_board = self.clear_captured_stones(next_board, 3 - player)
-
-        if self.count_group_liberties(next_board, i, j) >= 1 and not self.is_ko_violation(prev_board, next_board):
-            return True
-        return False
+        return bool(self.legal_move_mask(board, prev_board, player)[i, j])
 
     
     def is_eye(self, board, row, col, color):
@@ -90,133 +181,758 @@ class GoGame:
                 return False
         return True
 
-    def list_legal_moves(self, board, prev_board, player):
-        legal = []
-        for i, j in np.ndindex(self.BOARD_SIZE, self.BOARD_SIZE):
-            if self.is_legal_action(board, prev_board, player, i, j):
-                legal.append((i, j))
-        return legal
+    def label_groups(self, board):
+        # 用数组运算一次性标记所有棋块及其气数
+        # 返回末尾补一个棋盘外哨兵(-1)的展平棋盘、每点所属棋块的标号（棋块内最小下标，空点为 N*N）、
+        # 以及按标号索引的气数
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        nb = self.neighbor_index
+        flat = np.append(board.ravel(), -1)
+        stone = flat > 0
+        labels = np.where(stone, np.arange(nn + 1), nn)
+        same = (flat[nb] == flat[:nn, None]) & stone[:nn, None]
+        while True:
+            merged = labels.copy()
+            merged[:nn] = np.minimum(labels[:nn], np.where(same, labels[nb], nn).min(axis=1))
+            merged = merged[merged]  # 标号总指向同一棋块内的子，可直接跳跃
+            if np.array_equal(merged, labels):
+                break
+            labels = merged
+        points = np.flatnonzero(flat[:nn] == 0)
+        adjacent = np.zeros((nn + 1, nn), dtype=bool)
+        adjacent[labels[nb[points]], points[:, None]] = True
+        adjacent[nn] = False
+        return flat, labels, adjacent.sum(axis=1)
+
+    def legal_move_mask(self, board, prev_board, player, fill_eyes=False):
+        # 一次性判断所有空点：禁止自杀和打劫，返回布尔矩阵
+        # 默认还禁止堵自己的眼；fill_eyes=True 时与 host.py 的规则完全一致（数子计分时堵眼也多一子）
+        n = self.BOARD_SIZE
+        nn = n * n
+        nb = self.neighbor_index
+        opponent = 3 - player
+        analysis = self.analyze(board)
+        flat, labels, liberties = analysis.flat, analysis.labels, analysis.liberties
+        nb_color = flat[nb]
+        nb_liberties = liberties[labels[nb]]
+
+        eye = ((nb_color == player) | (nb_color == -1)).all(axis=1)
+        capture = ((nb_color == opponent) & (nb_liberties == 1)).any(axis=1)
+        breathe = (nb_color == 0).any(axis=1) | ((nb_color == player) & (nb_liberties >= 2)).any(axis=1)
+        legal = (flat[:nn] == 0) & (breathe | capture)
+        if not fill_eyes:
+            legal &= ~eye
+
+        # 落子后不能回到 prev_board：提子的点逐个还原检查，不提子时只可能是恰好差这一子
+        prev = np.asarray(prev_board).ravel()
+        for k in np.flatnonzero(legal & capture):
+            next_flat = flat[:nn].copy()
+            next_flat[k] = player
+            dead = labels[nb[k]][(nb_color[k] == opponent) & (nb_liberties[k] == 1)]
+            next_flat[np.isin(labels[:nn], dead)] = 0
+            if np.array_equal(next_flat, prev):
+                legal[k] = False
+        diff = np.flatnonzero(flat[:nn] != prev)
+        if len(diff) == 1 and prev[diff[0]] == player and not capture[diff[0]]:
+            legal[diff[0]] = False
+        return legal.reshape(n, n)
+
+    def list_legal_moves(self, board, prev_board, player, fill_eyes=False):
+        n = self.BOARD_SIZE
+        return [divmod(int(k), n) for k in np.flatnonzero(self.legal_move_mask(board, prev_board, player, fill_eyes))]
 
     def simulate_move(self, board, move, player):
+        # 只有与落子相邻、且只剩这一口气的对方棋块会被提掉，直接从父局面的分析中取出
+        n = self.BOARD_SIZE
+        k = move[0] * n + move[1]
+        analysis = self.analyze(board)
+        nb = self.neighbor_index[k]
+        dead = analysis.labels[nb][(analysis.flat[nb] == 3 - player) & (analysis.liberties[analysis.labels[nb]] == 1)]
         new_board = np.copy(board)
-        new_board[move[0], move[1]] = player
-        new_board = self.clear_captured_stones(new_board, 3 - player)
+        flat = new_board.ravel()
+        flat[k] = player
+        if len(dead):
+            flat[np.isin(analysis.labels[:n * n], dead)] = 0
         return new_board
-    
+
+    def tactical_scores(self, board, color):
+        # 每个空点对 color 方的战术分（按展平下标）：能提掉对方被叫吃的棋块得 2，能给己方被叫吃的棋块长气得 1
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        nb = self.neighbor_index
+        analysis = self.analyze(board)
+        opponent, own = analysis.atari[3 - color], analysis.atari[color]
+        if not len(opponent) and not len(own):
+            return np.zeros(nn, dtype=int)  # 没有被叫吃的棋块，所有点都是 0 分
+        nb_labels = analysis.labels[nb]
+        capture = np.isin(nb_labels, opponent).any(axis=1)
+        escape = np.isin(nb_labels, own).any(axis=1)
+        return np.where(analysis.flat[:nn] == 0, 2 * capture + escape, 0)
+
     def evaluate_board_state(self, board, color):
-        score_self, score_opponent = 0, 0
-        for i, j in np.ndindex(self.BOARD_SIZE, self.BOARD_SIZE):
-            if board[i, j] == color:
-                score_self += 1 + self.count_group_liberties(board, i, j)
-            elif board[i, j] == 3 - color:
-                score_opponent += 1 + self.count_group_liberties(board, i, j)
+        analysis = self.analyze(board)
+        nn = self.BOARD_SIZE * self.BOARD_SIZE
+        own = analysis.flat[:nn] == color
+        opponent = analysis.flat[:nn] == 3 - color
+        score_self = int(own.sum() + analysis.stone_liberties[own].sum())
+        score_opponent = int(opponent.sum() + analysis.stone_liberties[opponent].sum())
         return score_self - score_opponent
 
-class MiniMaxAI:
-    def __init__(self, game, depth=2):
+# 开局库文件：文件头之后是按键排序的 (规范局面键, 规范朝向下的着法下标)
+BOOK_MAGIC = b'GOBK0001'
+BOOK_HEADER = np.dtype([('magic', 'S8'), ('board_size', '<i4')])
+BOOK_ENTRY = np.dtype([('key', '<u8'), ('move', 'u1')])
+_opening_books = {}  # 路径 -> 已读入的开局库，同一进程内只读一次
+
+
+def load_opening_book(path, board_size=5):
+    # 返回按键排序的条目数组；文件缺失或格式不符时返回 None，调用方照常搜索
+    if path not in _opening_books:
+        book = None
+        try:
+            header = np.fromfile(path, dtype=BOOK_HEADER, count=1)
+            if len(header) == 1 and header[0]['magic'] == BOOK_MAGIC and header[0]['board_size'] == board_size:
+                book = np.fromfile(path, dtype=BOOK_ENTRY, offset=BOOK_HEADER.itemsize)
+        except (OSError, ValueError):
+            pass
+        _opening_books[path] = book
+    return _opening_books[path]
+
+
+def book_move(game, book):
+    # 在开局库中查当前局面，把规范朝向下的着法映射回实际棋盘；没有或不合法时返回 None
+    key, t = game.canonical_hash(game.board, game.color)
+    i = int(np.searchsorted(book['key'], key))
+    if i == len(book) or int(book[i]['key']) != key:
+        return None
+    move = int(book[i]['move'])
+    if move >= game.BOARD_SIZE * game.BOARD_SIZE:
+        return None
+    k = int(game.symmetries[t][move])
+    if not game.legal_move_mask(game.board, game.prev_board, game.color).ravel()[k]:
+        return None
+    return divmod(k, game.BOARD_SIZE)
+
+
+# 残局库文件：文件头之后是按键开放寻址（线性探测）的散列表，键为 0 的是空槽
+# 条目是 (状态键, 走棋方的结果：1 胜 0 和 -1 负, 规范朝向下的最佳着法下标，N*N 表示停一手)
+TABLE_MAGIC = b'GOTB0002'  # 0002：着法按 host.py 的规则生成，包括堵眼
+TABLE_HEADER = np.dtype([('magic', 'S8'), ('board_size', '<i4'), ('max_empty', '<i4'), ('slots', '<i8')])
+TABLE_ENTRY = np.dtype([('key', '<u8'), ('value', 'i1'), ('move', 'u1')])
+TABLE_SCORE = 1000  # 残局库胜负在 MiniMaxAI 中的分值，大于任何评估值
+# 残局库和棋在 MiniMaxAI 中的分值（AI 一方视角）：不是整数也不是 0.005 的倍数，不会和任何评估值相同，
+# 查到的和棋能和估值 0 区分开，并且 AI 把它看得比同样是 0 分的未证明局面略好
+TABLE_DRAW = 0.001
+_endgame_tables = {}  # 路径 -> 已映射的残局库，同一进程内只打开一次
+
+
+class EndgameTable:
+    def __init__(self, entries, max_empty):
+        self.entries = entries
+        self.mask = len(entries) - 1  # 槽数是 2 的幂
+        self.max_empty = max_empty  # 库中局面最多的空点数，更空的局面不必查
+
+    @classmethod
+    def load(cls, path, board_size=5):
+        # 以只读内存映射打开，不读入条目；文件缺失或格式不符时返回 None
+        if path not in _endgame_tables:
+            table = None
+            try:
+                header = np.fromfile(path, dtype=TABLE_HEADER, count=1)
+                if len(header) == 1 and header[0]['magic'] == TABLE_MAGIC and header[0]['board_size'] == board_size:
+                    entries = np.memmap(path, dtype=TABLE_ENTRY, mode='r', offset=TABLE_HEADER.itemsize,
+                                        shape=(int(header[0]['slots']),))
+                    table = cls(entries, int(header[0]['max_empty']))
+            except (OSError, ValueError):
+                pass
+            _endgame_tables[path] = table
+        return _endgame_tables[path]
+
+    def probe(self, key):
+        # 返回 (走棋方的结果, 规范朝向下的着法下标)，没有该状态时返回 None
+        i = key & self.mask
+        while True:
+            entry = self.entries[i]
+            stored = int(entry['key'])
+            if stored == key:
+                return int(entry['value']), int(entry['move'])
+            if stored == 0:
+                return None
+            i = (i + 1) & self.mask
+
+    def lookup(self, game, board, prev_board, color, moves_left, passes):
+        # 查一个状态，着法映射回实际棋盘（停一手为 'PASS'），返回 (走棋方的结果, 着法)；查不到返回 None
+        if moves_left <= 0 or np.count_nonzero(board == 0) > self.max_empty:
+            return None
+        state = game.state_hash(board, prev_board, color, moves_left, passes)
+        if state is None:
+            return None
+        key, t = state
+        found = self.probe(key)
+        if found is None:
+            return None
+        value, move = found
+        n = game.BOARD_SIZE
+        return value, 'PASS' if move >= n * n else divmod(int(game.symmetries[t][move]), n)
+
+
+def table_move(game, table):
+    # 在残局库中查当前局面，有赢棋或和棋的着法时返回它，否则返回 None
+    found = table.lookup(game, game.board, game.prev_board, game.color, estimate_moves_left(game), root_passes(game))
+    if found is None or found[0] < 0:
+        return None
+    move = found[1]
+    if move != 'PASS' and not game.legal_move_mask(game.board, game.prev_board, game.color)[move]:
+        return None
+    return move
+
+
+def root_passes(game):
+    # 上一局面和当前局面相同说明对方刚停了一手，这时再停一手对局就结束
+    return int(np.array_equal(game.board, game.prev_board) and np.count_nonzero(game.board) > 0)
+
+
+def estimate_moves_left(game):
+    # 输入里没有已下手数：已下手数至少是盘上子数，且轮到黑方时为偶数、轮到白方时为奇数
+    n = game.BOARD_SIZE
+    stones = int(np.count_nonzero(game.board))
+    played = stones + (stones - game.color + 1) % 2
+    return max(n * n - 1 - played, 1)
+
+
+class ProofNode:
+    __slots__ = ('board', 'prev', 'color', 'passes', 'moves_left', 'move', 'parent', 'children', 'proof', 'disproof')
+
+    def __init__(self, board, prev, color, passes, moves_left, move=None, parent=None):
+        self.board = board
+        self.prev = prev
+        self.color = color  # 轮到走棋的一方
+        self.passes = passes  # 连续停一手的次数
+        self.moves_left = moves_left  # 到 host.py 手数上限还剩的手数
+        self.move = move  # 从父节点走到这里的着法
+        self.parent = parent
+        self.children = None  # 未展开时为 None
+        self.proof = 1  # 证明目标方获胜至少还要证明的叶子数
+        self.disproof = 1  # 证否至少还要证明的叶子数
+
+
+class ProofNumberSolver:
+    # 证明数搜索：按 host.py 的规则（n*n-1 手或双方连续停一手结束，数子、白贴 n/2）证明终局胜负
+    def __init__(self, game, max_nodes=200000, table=None):
         self.game = game
-        self.depth = depth
-        self.transposition_table = {} 
+        n = game.BOARD_SIZE
+        self.komi = n / 2
+        self.max_nodes = max_nodes  # 树的节点数上限，超过后当作证不出
+        self.table = table  # 残局库，库里有的叶子直接定值
+        self.nodes = 0
+
+    def winner(self, board):
+        black = int(np.count_nonzero(board == 1))
+        white = int(np.count_nonzero(board == 2))
+        if black > white + self.komi:
+            return 1
+        if black < white + self.komi:
+            return 2
+        return 0
+
+    def set_numbers(self, node, target):
+        # 终局直接定值，或者由子节点算出：目标方走棋的节点取子节点证明数的最小值、证否数之和，对方走棋时相反
+        if node.children is None:
+            if node.passes >= 2 or node.moves_left <= 0:
+                winner = self.winner(node.board)
+            elif self.table is not None:
+                found = self.table.lookup(self.game, node.board, node.prev, node.color, node.moves_left, node.passes)
+                if found is None:
+                    return
+                winner = (0, node.color, 3 - node.color)[found[0]]
+            else:
+                return
+            node.proof, node.disproof = (0, float('inf')) if winner == target else (float('inf'), 0)
+        elif node.color == target:
+            node.proof = min(child.proof for child in node.children)
+            node.disproof = sum(child.disproof for child in node.children)
+        else:
+            node.proof = sum(child.proof for child in node.children)
+            node.disproof = min(child.disproof for child in node.children)
+
+    def expand(self, node, target):
+        # 着法按 host.py 的规则生成，包括堵自己的眼；合法着法之外总可以停一手
+        # 停一手后 host.py 把上一局面设为当前局面，打劫限制随之解除
+        children = []
+        for move in self.game.list_legal_moves(node.board, node.prev, node.color, fill_eyes=True):
+            board = self.game.simulate_move(node.board, move, node.color)
+            children.append(ProofNode(board, node.board, 3 - node.color, 0, node.moves_left - 1, move, node))
+        children.append(ProofNode(node.board, node.board, 3 - node.color, node.passes + 1, node.moves_left - 1,
+                                  'PASS', node))
+        for child in children:
+            self.set_numbers(child, target)
+        node.children = children
+        self.nodes += len(children)
+
+    def prove(self, board, prev, color, passes, moves_left, target, deadline):
+        # 证明 target 方能否获胜，返回 (结果, 着法)：证明时着法是根节点证明成立的子节点，
+        # 证否时是证否成立的子节点（根节点轮到 target 走时证否没有着法可给）；时间或节点数用尽返回 (None, None)
+        root = ProofNode(board, prev, color, passes, moves_left)
+        self.set_numbers(root, target)
+        self.nodes = 1
+        while root.proof and root.disproof:
+            if time.time() > deadline or self.nodes > self.max_nodes:
+                return None, None
+            # 沿最需要证明的路径走到未展开的叶子：目标方走棋处取证明数最小的子节点，对方走棋处取证否数最小的
+            node = root
+            while node.children is not None:
+                if node.color == target:
+                    node = min(node.children, key=lambda child: child.proof)
+                else:
+                    node = min(node.children, key=lambda child: child.disproof)
+            self.expand(node, target)
+            while node is not None:
+                self.set_numbers(node, target)
+                node = node.parent
+        proved = root.proof == 0
+        number = 'proof' if proved else 'disproof'
+        moves = [child.move for child in root.children or () if getattr(child, number) == 0]
+        return proved, moves[0] if moves else None
+
+    def solve(self, board, prev, color, passes, moves_left, deadline):
+        # 返回 (胜方, 着法)，胜方为 0 表示和棋；着法是走棋方取得该结果的一手，输棋时为 None
+        # 时间内证不出时返回 (None, None)
+        proved, move = self.prove(board, prev, color, passes, moves_left, color, deadline)
+        if proved is None:
+            return None, None
+        if proved:
+            return color, move
+        if self.komi % 1:
+            return 3 - color, None  # 贴目有半子时没有和棋，赢不了就是输
+        proved, move = self.prove(board, prev, color, passes, moves_left, 3 - color, deadline)
+        if proved is None:
+            return None, None
+        return (3 - color, None) if proved else (0, move)
+
+
+def solve_endgame(game, time_limit, table=None):
+    # 空点足够少时求解当前局面，有赢棋或和棋的着法时返回它，否则返回 None 交给 MiniMaxAI
+    if np.count_nonzero(game.board == 0) >= SOLVER_EMPTY:
+        return None
+    solver = ProofNumberSolver(game, table=table)
+    winner, move = solver.solve(game.board, game.prev_board, game.color, root_passes(game), estimate_moves_left(game),
+                                time.time() + time_limit)
+    if winner is None or move is None:
+        return None
+    return move
+
+
+# 零窗口的宽度，也是根节点保留同分着法时窗口下沿让出的量
+# 评估函数的不同取值之差必须大于它：my_player3 的评估是整数，my_player4 的是 0.005 的倍数，残局库和棋是 TABLE_DRAW
+NULL_WINDOW = 1e-6
+
+
+class SearchTimeout(Exception):
+    # 超过本步时限时由搜索抛出，未完成的那一轮迭代整体作废
+    pass
+
+
+# 置换表条目的界类型，0 表示空槽
+EXACT, LOWER, UPPER = 1, 2, 3
+TT_ENTRY = np.dtype([('key', '<u8'), ('value', '<f8'), ('depth', 'i1'), ('flag', 'i1'), ('move', '<i2')])
+# 缓存文件头：格式版本、棋盘大小、AI 的颜色（评估站在 AI 一方）和桶数，任何一项不符就重建文件
+CACHE_MAGIC = b'GOTT0002'
+CACHE_HEADER = np.dtype([('magic', 'S8'), ('board_size', '<i4'), ('color', '<i4'), ('buckets', '<i8')])
+
+
+class TranspositionTable:
+    # 固定容量的置换表，条目存在预先分配的数组里，内存占用与搜索量无关
+    # 每个桶两个槽：第 0 槽按深度优先保留较深的结果，第 1 槽总是写入新结果
+    # key 字段存局面键与其余字段校验值的异或，写到一半的条目（进程被杀、多个进程同时写）解不出原来的键，按未命中处理
+    def __init__(self, capacity=1 << 18, entries=None):
+        self.buckets = max(1, capacity // 2)
+        self.entries = np.zeros((self.buckets, 2), dtype=TT_ENTRY) if entries is None else entries
+        self.shm = None  # 放在共享内存里时的内存块
+        self.stop = None  # 共享内存开头的停止标志，Lazy SMP 的主进程搜完后置 1
+
+    @classmethod
+    def shared(cls, capacity, name=None):
+        # 放在共享内存里的置换表，开头 8 字节是停止标志，其后是条目数组
+        # name 为 None 时新建一块，否则接到已有的那块上；多个进程同时读写不加锁，写坏的条目靠校验值识别
+        # 只有 Lazy SMP 用到共享内存，在这里才导入，文件模式只依赖 read/write 和 numpy
+        from multiprocessing import shared_memory
+        buckets = max(1, capacity // 2)
+        if name is None:
+            shm = shared_memory.SharedMemory(create=True, size=8 + buckets * 2 * TT_ENTRY.itemsize)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        table = cls(capacity, np.ndarray((buckets, 2), dtype=TT_ENTRY, buffer=shm.buf, offset=8))
+        table.shm = shm
+        table.stop = np.ndarray(1, dtype=np.uint8, buffer=shm.buf)
+        return table
+
+    def close(self, unlink=False):
+        # 释放共享内存；先丢掉指向它的数组，否则内存块无法关闭
+        if self.shm is None:
+            return
+        self.entries = self.stop = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+        self.shm = None
+
+    @classmethod
+    def open(cls, path, capacity, board_size, color):
+        # 打开放在内存映射文件里的置换表，条目在多次运行之间保留；打开时只读文件头
+        # 文件缺失、大小不对或文件头不符时换成一个空文件，先写临时文件再替换，其他进程不会读到半个文件
+        buckets = max(1, capacity // 2)
+        header = np.zeros(1, dtype=CACHE_HEADER)
+        header[0] = (CACHE_MAGIC, board_size, color, buckets)
+        size = CACHE_HEADER.itemsize + buckets * 2 * TT_ENTRY.itemsize
+        try:
+            valid = (os.path.getsize(path) == size and
+                     np.fromfile(path, dtype=CACHE_HEADER, count=1).tobytes() == header.tobytes())
+        except (OSError, ValueError):
+            valid = False
+        if not valid:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header.tobytes())
+                f.truncate(size)
+            os.replace(tmp, path)
+        entries = np.memmap(path, dtype=TT_ENTRY, mode='r+', offset=CACHE_HEADER.itemsize, shape=(buckets, 2))
+        return cls(capacity, entries)
+
+    @staticmethod
+    def check(value, depth, flag, move):
+        data = struct.pack('<dbbh', value, depth, flag, move)
+        return int.from_bytes(data[:8], 'little') ^ int.from_bytes(data[8:], 'little')
+
+    def entry_key(self, entry):
+        # 槽中条目的局面键，空槽为 None
+        if not entry['flag']:
+            return None
+        return int(entry['key']) ^ self.check(float(entry['value']), int(entry['depth']), int(entry['flag']),
+                                              int(entry['move']))
+
+    def probe(self, key):
+        # 返回 (depth, flag, value, move)，没有该局面时返回 None
+        for entry in self.entries[key % self.buckets]:
+            if self.entry_key(entry) == key:
+                return int(entry['depth']), int(entry['flag']), float(entry['value']), int(entry['move'])
+        return None
+
+    def store(self, key, depth, flag, value, move):
+        bucket = self.entries[key % self.buckets]
+        record = (key ^ self.check(value, depth, flag, move), value, depth, flag, move)
+        deep = self.entry_key(bucket[0])
+        if deep is not None and deep != key:
+            if depth < bucket[0]['depth']:
+                bucket[1] = record
+                return
+            bucket[1] = bucket[0]  # 被挤出深度槽的结果降到第 1 槽
+        bucket[0] = record
 
-    def board_to_key(self, board):
-        return hash(board.tobytes()) 
 
-    def minimax(self, curr, prev, depth, alpha, beta, color):
-        board_key = (self.board_to_key(curr), depth, color)
+class MiniMaxAI:
+    def __init__(self, game, depth=2, time_limit=None, tt_capacity=1 << 18, cache_file=None, processes=1,
+                 ordering='full', pvs=True, aspiration=None, endgame_file=None):
+        self.game = game
+        self.depth = depth  # 迭代加深的最大深度
+        self.time_limit = time_limit  # 每步限时（秒），None 表示不限时、一直搜到 depth
+        self.tt_capacity = tt_capacity
+        self.processes = processes  # 大于 1 时用 Lazy SMP，置换表改放共享内存，不用 cache_file
+        self.stop = None  # Lazy SMP 辅助进程的停止标志
+        # 给出 cache_file 时置换表放在该文件里，下一步（下一次运行）接着用
+        if cache_file and processes == 1:
+            self.transposition_table = TranspositionTable.open(cache_file, tt_capacity, game.BOARD_SIZE, game.color)
+        else:
+            self.transposition_table = TranspositionTable(tt_capacity)
+        self.deadline = None
+        self.nodes = 0
+        self.pv = []  # 上一轮完整迭代的主变，下一轮沿它先搜
+        self.pv_table = {}  # 本轮搜索中各层找到的主变：ply -> 着法列表
+        self.reached_horizon = False  # 本轮是否有分支因深度用尽而停下
+        # 着法排序：'none' 按棋盘顺序；'tt' 只提前主变和置换表着法；'full' 再依次排提子、逃出叫吃、杀手着法和历史分
+        self.ordering = ordering
+        self.killers = {}  # ply -> 最近在这一层引起剪枝的着法（最多两个）
+        nn = game.BOARD_SIZE * game.BOARD_SIZE
+        self.history = {1: [0] * nn, 2: [0] * nn}  # 颜色 -> 各点引起剪枝的累计分（深度平方）
+        self.pvs = pvs  # 主变搜索：第一个着法用完整窗口，其余先用零窗口试探，超出下沿再重搜
+        self.aspiration = aspiration  # 根节点围绕上一轮分值的窗口半宽，落在窗口外时加宽重搜；None 表示不用
+        # 给出 endgame_file 时各节点先查残局库，查到的胜负直接作为精确值
+        self.endgame_file = endgame_file
+        self.endgame_table = EndgameTable.load(endgame_file, game.BOARD_SIZE) if endgame_file else None
+        self.moves_left = estimate_moves_left(game) if self.endgame_table is not None else None
+
+    def board_to_key(self, board, color):
+        # 旋转、翻转后相同的局面共用一个条目；返回 (规范键, 变换下标)，表中着法按规范朝向存放
+        return self.game.canonical_hash(board, color)
+
+    def check_time(self):
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout
+        if self.stop is not None and self.stop[0]:
+            raise SearchTimeout
+
+    def evaluate(self, board, color):
+        # 评估始终站在 AI 一方，轮到对手走时取负，换成走棋方视角
+        val = self.game.evaluate_board_state(board, self.game.color)
+        return val if color == self.game.color else -val
+
+    def order_moves(self, board, moves, color, ply, tt_move, pv_move):
+        # 仍在上一轮主变上时先走主变中这一层的着法，其次是置换表记下的最佳着法
+        if self.ordering == 'none':
+            return moves
+        first = []
+        for move in (pv_move, tt_move):
+            if move in moves and move not in first:
+                first.append(move)
+        rest = [move for move in moves if move not in first]
+        if self.ordering == 'full':
+            n = self.game.BOARD_SIZE
+            tactical = self.game.tactical_scores(board, color)
+            killers = self.killers.get(ply, ())
+            history = self.history[color]
+            rest.sort(key=lambda m: (tactical[m[0] * n + m[1]], m in killers, history[m[0] * n + m[1]]), reverse=True)
+        return first + rest
+
+    def record_cutoff(self, move, color, depth, ply):
+        # 引起剪枝的着法记为这一层的杀手着法，并按深度平方累计历史分
+        if self.ordering != 'full':
+            return
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[color][move[0] * self.game.BOARD_SIZE + move[1]] += depth * depth
+
+    def negamax(self, curr, prev, depth, alpha, beta, color, ply, on_pv):
+        self.nodes += 1
+        if self.nodes % 64 == 0:
+            self.check_time()
+        self.pv_table[ply] = []
+
+        if self.endgame_table is not None:
+            found = self.endgame_table.lookup(self.game, curr, prev, color, self.moves_left - ply, 0)
+            if found is not None:
+                if found[0]:
+                    return found[0] * TABLE_SCORE
+                # 和棋和 evaluate 一样站在 AI 一方，轮到对手走时取负
+                return TABLE_DRAW if color == self.game.color else -TABLE_DRAW
 
-        if board_key in self.transposition_table and 'moves' in self.transposition_table[board_key]:
-            return self.transposition_table[board_key]['moves']
+        if depth == 0:
+            self.reached_horizon = True
+            return self.evaluate(curr, color)
+
+        n = self.game.BOARD_SIZE
+        board_key, t = self.board_to_key(curr, color)
+        tt_move = None
+        entry = self.transposition_table.probe(board_key)
+        if entry is not None:
+            tt_depth, flag, val, move = entry
+            if move >= 0:
+                tt_move = divmod(int(self.game.symmetries[t][move]), n)
+            # 至少同样深的结果才能直接用：精确值直接返回，上下界收窄窗口
+            if tt_depth >= depth:
+                if flag == EXACT:
+                    self.reached_horizon = True
+                    return val
+                if flag == LOWER:
+                    alpha = max(alpha, val)
+                else:
+                    beta = min(beta, val)
+                if alpha >= beta:
+                    self.reached_horizon = True
+                    return val
 
-        best_val = -float('inf')
-        best_moves = []
         valid_moves = self.game.list_legal_moves(curr, prev, color)
+        if not valid_moves:
+            return self.evaluate(curr, color)
+        alpha_orig, beta_orig = alpha, beta
+
+        pv_move = self.pv[ply] if on_pv and ply < len(self.pv) else None
+        valid_moves = self.order_moves(curr, valid_moves, color, ply, tt_move, pv_move)
 
+        best_val = -float('inf')
+        best_move = None
         for move in valid_moves:
             next_board = self.game.simulate_move(curr, move, color)
-            val = -self.min_play(next_board, curr, depth - 1, -beta, -alpha, 3 - color)
+            if self.pvs and best_move is not None:
+                val = -self.negamax(next_board, curr, depth - 1, -alpha - NULL_WINDOW, -alpha, 3 - color, ply + 1,
+                                    move == pv_move)
+                if alpha < val < beta:
+                    val = -self.negamax(next_board, curr, depth - 1, -beta, -alpha, 3 - color, ply + 1,
+                                        move == pv_move)
+            else:
+                val = -self.negamax(next_board, curr, depth - 1, -beta, -alpha, 3 - color, ply + 1, move == pv_move)
+
+            if val > best_val:
+                best_val = val
+                best_move = move
+                if val > alpha:
+                    alpha = val
+                    self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+                    if alpha >= beta:
+                        self.record_cutoff(move, color, depth, ply)
+                        break
+
+        # 按实际搜索的窗口（已被置换表收窄）判断界类型：不超过下沿是上界，达到上沿是下界
+        if best_val <= alpha_orig:
+            flag = UPPER
+        elif best_val >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        move = int(self.game.inverse_symmetries[t][best_move[0] * n + best_move[1]])
+        self.transposition_table.store(board_key, depth, flag, best_val, move)
+        return best_val
+
+    def search_root(self, depth, moves, low=-float('inf'), high=float('inf')):
+        # 在窗口 (low, high) 内搜一轮固定深度，返回 (最佳值, 同分的最佳着法, 主变)
+        # 子节点窗口的下沿比当前最佳值略低，同分的着法也能得到精确值；最佳值落在窗口外时只是一个界
+        board, color = self.game.board, self.game.color
+        best_val = -float('inf')
+        best_moves = []
+        pv = []
+        for move in moves:
+            next_board = self.game.simulate_move(board, move, color)
+            alpha = max(low, best_val - NULL_WINDOW)
+            on_pv = bool(self.pv) and move == self.pv[0]
+            if self.pvs and best_moves:
+                val = -self.negamax(next_board, board, depth - 1, -alpha - NULL_WINDOW, -alpha, 3 - color, 1, on_pv)
+                if alpha < val < high:
+                    val = -self.negamax(next_board, board, depth - 1, -high, -alpha, 3 - color, 1, on_pv)
+            else:
+                val = -self.negamax(next_board, board, depth - 1, -high, -alpha, 3 - color, 1, on_pv)
 
             if val > best_val:
                 best_val = val
                 best_moves = [move]
-                alpha = max(alpha, val)
+                pv = [move] + self.pv_table[1]
             elif val == best_val:
                 best_moves.append(move)
-
-            if alpha >= beta:
+        return best_val, best_moves, pv
+
+    def aspiration_search(self, depth, moves, guess):
+        # 先在上一轮分值 guess 附近的窗口里搜，失败的一侧每次把半宽加倍后重搜，直到最佳值落在窗口内
+        if self.aspiration is None or guess is None:
+            return self.search_root(depth, moves)
+        delta = self.aspiration
+        low, high = guess - delta, guess + delta
+        while True:
+            val, best_moves, pv = self.search_root(depth, moves, low, high)
+            if val <= low:
+                low = val - delta
+            elif val >= high:
+                high = val + delta
+            else:
+                return val, best_moves, pv
+            delta *= 2
+
+    def iterate(self, moves, start, first_depth=1):
+        # 迭代加深：每轮深度加一，上一轮的最佳着法排在最前；超时的一轮作废，用最后一轮完整结果
+        # 返回 (完成的最大深度, 同分的最佳着法)，一轮都没搜完时深度为 0
+        # 第一轮也受时限约束，超时时在全部合法着法中随机选一个
+        self.deadline = start + self.time_limit if self.time_limit is not None else None
+        self.pv = []
+        completed, best_moves, score = 0, moves, None
+        for depth in range(first_depth, self.depth + 1):
+            ordered = best_moves + [move for move in moves if move not in best_moves]
+            self.reached_horizon = False
+            try:
+                score, best_moves, self.pv = self.aspiration_search(depth, ordered, score)
+            except SearchTimeout:
                 break
-
-        self.transposition_table[board_key] = {'val': best_val, 'moves': best_moves}
-        return best_moves
-
-    def min_play(self, curr, prev, depth, alpha, beta, color):
-        board_key = (self.board_to_key(curr), depth, color)
-
-        if board_key in self.transposition_table and 'val' in self.transposition_table[board_key]:
-            return self.transposition_table[board_key]['val']
-
-        if depth == 0:
-            val = self.game.evaluate_board_state(curr, self.game.color)
-            self.transposition_table[board_key] = {'val': val}
-            return val
-
-        val = float('inf')
-        valid_moves = self.game.list_legal_moves(curr, prev, color)
-
-        for move in valid_moves:
-            next_board = self.game.simulate_move(curr, move, color)
-            val = min(val, -self.max_play(next_board, curr, depth - 1, -beta, -alpha, 3 - color))
-
-            if val <= alpha:
-                break
-            beta = min(beta, val)
-
-        self.transposition_table[board_key] = {'val': val}
-        return val
-
-    def max_play(self, curr, prev, depth, alpha, beta, color):
-        board_key = (self.board_to_key(curr), depth, color)
-
-        if board_key in self.transposition_table and 'val' in self.transposition_table[board_key]:
-            return self.transposition_table[board_key]['val']
-
-        if depth == 0:
-            val = self.game.evaluate_board_state(curr, self.game.color)
-            self.transposition_table[board_key] = {'val': val}
-            return val
-
-        val = -float('inf')
-        valid_moves = self.game.list_legal_moves(curr, prev, color)
-
-        for move in valid_moves:
-            next_board = self.game.simulate_move(curr, move, color)
-            val = max(val, -self.min_play(next_board, curr, depth - 1, -beta, -alpha, 3 - color))
-
-            if val >= beta:
+            completed = depth
+            if not self.reached_horizon:
+                break  # 所有分支都已走到终局，再加深结果也不会变
+            if self.deadline is not None and time.time() >= self.deadline:
                 break
-            alpha = max(alpha, val)
-
-        self.transposition_table[board_key] = {'val': val}
-        return val
+        return completed, best_moves
+
+    def lazy_smp(self, moves, start):
+        # Lazy SMP：辅助进程和本进程在同一张共享置换表上搜同一根节点，互相利用对方存下的结果
+        # 辅助进程错开起始深度、打乱根着法顺序；本进程搜完后通知它们停下，取完成深度最深的结果
+        table = TranspositionTable.shared(self.tt_capacity)
+        self.transposition_table = table
+        game = self.game
+        state = (game.color, game.prev_board.tolist(), game.board.tolist())
+        settings = dict(depth=self.depth, time_limit=self.time_limit, tt_capacity=self.tt_capacity,
+                        ordering=self.ordering, pvs=self.pvs, aspiration=self.aspiration,
+                        endgame_file=self.endgame_file)
+        tasks = [(type(self), type(game), state, settings, table.shm.name, 2 + helper % 2, start,
+                  random.getrandbits(64)) for helper in range(self.processes - 1)]
+        try:
+            pending = get_pool(self.processes - 1).map_async(smp_worker, tasks)
+            depth, best_moves = self.iterate(moves, start)
+            table.stop[0] = 1
+            for helper_depth, helper_moves in pending.get():
+                if helper_depth > depth:
+                    depth, best_moves = helper_depth, helper_moves
+        finally:
+            table.stop[0] = 1
+            table.close(unlink=True)
+        return best_moves
 
     def choose_best_move(self):
+        start = time.time()
         my_moves = self.game.list_legal_moves(self.game.board, self.game.prev_board, self.game.color)
-        opp_moves = self.game.list_legal_moves(self.game.board, self.game.prev_board, 3 - self.game.color)
-
-        if not my_moves and not opp_moves:
-            return "PASS" 
-
         if not my_moves:
             return "PASS"
-
-        moves = self.minimax(self.game.board, self.game.prev_board, self.depth, -1000, 1000, self.game.color)
-        return random.choice(moves) if moves else "PASS"
+        if self.processes > 1:
+            return random.choice(self.lazy_smp(my_moves, start))
+        _, best_moves = self.iterate(my_moves, start)
+        return random.choice(best_moves)
+
+
+_pools = {}  # 进程数 -> 进程池，同一进程里的各步共用，不必每步重新启动
+
+def get_pool(processes):
+    if processes not in _pools:
+        _pools[processes] = multiprocessing.Pool(processes)
+        atexit.register(_pools[processes].terminate)
+    return _pools[processes]
+
+def smp_worker(task):
+    # Lazy SMP 的辅助进程：接到共享置换表上，从 first_depth 起迭代加深，返回 (完成的最大深度, 同分的最佳着法)
+    ai_class, game_class, (color, prev_board, board), settings, name, first_depth, start, seed = task
+    random.seed(seed)
+    game = game_class(len(board))
+    game.load_boards(color, prev_board, board)
+    ai = ai_class(game, **settings)
+    ai.transposition_table = TranspositionTable.shared(ai.tt_capacity, name)
+    ai.stop = ai.transposition_table.stop
+    try:
+        moves = game.list_legal_moves(game.board, game.prev_board, color)
+        random.shuffle(moves)
+        return ai.iterate(moves, start, first_depth)
+    finally:
+        ai.transposition_table.close()
+
+
+def get_move(color, prev_board, curr_board):
+    game = GoGame()
+    game.load_boards(color, prev_board, curr_board)
+    start = time.time()
+    book = load_opening_book(OPENING_BOOK)
+    move = book_move(game, book) if book is not None else None
+    table = EndgameTable.load(ENDGAME_TABLE)
+    if move is None and table is not None:
+        move = table_move(game, table)
+    if move is None:
+        move = solve_endgame(game, min(SOLVER_TIME, TIME_LIMIT - (time.time() - start)), table)
+    if move is not None:
+        return move
+    time_limit = max(TIME_LIMIT - (time.time() - start), 0.1)
+    ai = MiniMaxAI(game, depth=MAX_DEPTH, time_limit=time_limit, cache_file=SEARCH_CACHE, processes=PROCESSES,
+                   endgame_file=ENDGAME_TABLE if table is not None else None)
+    return ai.choose_best_move()
 
 
 if __name__ == '__main__':
-    color, prev_board, curr_board = readInput(5)
-
-    game = GoGame()
-    game.load_boards(color, prev_board, curr_board)
-    ai = MiniMaxAI(game, depth=4) 
-    action = ai.choose_best_move()
-    writeOutput(action)
\ No newline at end of file
+    if '--cache' in sys.argv:
+        SEARCH_CACHE = sys.argv[sys.argv.index('--cache') + 1]
+    if '--processes' in sys.argv:
+        PROCESSES = int(sys.argv[sys.argv.index('--processes') + 1])
+    if '--worker' in sys.argv:
+        # 仅 worker 模式需要 player_worker，文件模式仍可单独提交本脚本
+        from player_worker import serve
+        serve(get_move)
+    else:
+        color, prev_board, curr_board = readInput(5)
+        writeOutput(get_move(color, prev_board, curr_board))
\ No newline at end of file
@@ -0,0 +1,172 @@
+import sys
+import queue
+import threading
+import subprocess
+
+def encode_state(piece_type, previous_board, board):
+    '''
+    Encode one board state as a protocol line.
+
+    The line holds the piece type, then the previous and the current board written
+    row by row as one run of digits, e.g. "1 0000000000000000000000000 0000000000001000000000000".
+
+    :param piece_type: 1('X') or 2('O'), the player to move.
+    :param previous_board: previous board state.
+    :param board: current board state.
+    :return: the line, without the trailing newline.
+    '''
+    previous = "".join(str(cell) for row in previous_board for cell in row)
+    current = "".join(str(cell) for row in board for cell in row)
+    return "{} {} {}".format(piece_type, previous, current)
+
+def decode_state(line):
+    '''
+    Decode a protocol line written by encode_state.
+
+    :param line: the state line.
+    :return: (piece_type, previous_board, board).
+    '''
+    piece_type, previous, current = line.split()
+    n = int(round(len(current) ** 0.5))
+    previous_board = [[int(cell) for cell in previous[i * n:(i + 1) * n]] for i in range(n)]
+    board = [[int(cell) for cell in current[i * n:(i + 1) * n]] for i in range(n)]
+    return int(piece_type), previous_board, board
+
+def encode_move(move):
+    '''
+    Encode a move in the output.txt format.
+
+    :param move: (row, column) or "PASS".
+    :return: "row,column" or "PASS".
+    '''
+    if move == "PASS":
+        return "PASS"
+    return "{},{}".format(move[0], move[1])
+
+def decode_move(line):
+    '''
+    Decode a move line written by encode_move.
+
+    :param line: "row,column" or "PASS".
+    :return: (row, column) or "PASS".
+    '''
+    line = line.strip()
+    if line == "PASS":
+        return "PASS"
+    x, y = line.split(",")
+    return int(x), int(y)
+
+def serve(get_move, stdin=None, stdout=None):
+    '''
+    Run a player as a long-lived worker.
+
+    Reads one state line per move and answers each with one move line. "QUIT" or the
+    end of input stops the worker. While the player thinks, sys.stdout points at stderr
+    so stray prints cannot break the protocol.
+
+    :param get_move: the player's get_move(piece_type, previous_board, board).
+    :param stdin: stream of state lines, sys.stdin by default.
+    :param stdout: stream for move lines, sys.stdout by default.
+    :return: None.
+    '''
+    stdin = stdin or sys.stdin
+    out = stdout or sys.stdout
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            if line == "QUIT":
+                break
+            move = get_move(*decode_state(line))
+            out.write(encode_move(move) + "\n")
+            out.flush()
+    finally:
+        sys.stdout = real_stdout
+
+class WorkerPlayer:
+    def __init__(self, command, deadline=10.0):
+        '''
+        Client side of a player worker started once and reused for every move.
+
+        The worker can be any program that speaks the serve() line protocol, e.g.
+        "python my_player3.py --worker" or a compiled C++ or Java player.
+
+        :param command: argument list that starts the worker.
+        :param deadline: seconds allowed for each move.
+        '''
+        self.command = command
+        self.deadline = deadline
+        self.process = None
+        self.replies = None
+
+    def start(self):
+        '''
+        Start the worker process and the thread that collects its replies.
+
+        :return: None.
+        '''
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, bufsize=1)
+        # A fresh queue per process, so a late reply of a killed worker is never read as a move
+        self.replies = queue.Queue()
+        thread = threading.Thread(target=self.read_replies, args=(self.process, self.replies))
+        thread.daemon = True
+        thread.start()
+
+    @staticmethod
+    def read_replies(process, replies):
+        for line in process.stdout:
+            replies.put(line)
+        replies.put(None)
+
+    def get_move(self, piece_type, previous_board, board):
+        '''
+        Ask the worker for a move, starting it on first use.
+
+        :param piece_type: 1('X') or 2('O'), the player to move.
+        :param previous_board: previous board state.
+        :param board: current board state.
+        :return: (row, column) or "PASS".
+        :raises TimeoutError: no answer within the deadline. The worker is killed and restarted on the next call.
+        :raises RuntimeError: the worker exited.
+        '''
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+        try:
+            self.process.stdin.write(encode_state(piece_type, previous_board, board) + "\n")
+            self.process.stdin.flush()
+            line = self.replies.get(timeout=self.deadline)
+        except queue.Empty:
+            self.close()
+            raise TimeoutError("no move within {} seconds: {}".format(self.deadline, " ".join(self.command)))
+        except OSError:
+            line = None
+        if line is None:
+            self.close()
+            raise RuntimeError("worker exited: {}".format(" ".join(self.command)))
+        return decode_move(line)
+
+    def close(self):
+        '''
+        Stop the worker, killing it if it does not quit in time.
+
+        :return: None.
+        '''
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.write("QUIT\n")
+                process.stdin.flush()
+            process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
@@ -0,0 +1,31 @@
+from go_play import play_game
+
+class ScriptedPlayer:
+    # 按顺序返回给定的落子，用完后一直停一手
+    def __init__(self, moves):
+        self.moves = list(moves)
+        self.calls = 0
+
+    def get_move(self, piece_type, previous_board, board):
+        self.calls += 1
+        return self.moves.pop(0) if self.moves else "PASS"
+
+def test_single_pass_does_not_end_game():
+    black = ScriptedPlayer([(2, 2), "PASS", (0, 0)])
+    white = ScriptedPlayer([(1, 1), (3, 3)])
+    stats = {}
+    play_game(5, "black", "white", {1: black, 2: white}, stats=stats)
+    # 黑停一手后白继续落子，黑第三手照常走；之后两次连续停一手才结束
+    assert black.calls == 4
+    assert white.calls == 3
+    assert stats["moves"] == 7
+    assert stats["reason"] == "score"
+
+def test_two_passes_end_game():
+    black = ScriptedPlayer([(2, 2)])
+    white = ScriptedPlayer([])
+    stats = {}
+    # 黑只有一子，白贴 2.5 目获胜
+    assert play_game(5, "black", "white", {1: black, 2: white}, stats=stats) == 2
+    assert (black.calls, white.calls) == (2, 1)
+    assert stats["moves"] == 3
@@ -0,0 +1,189 @@
+import argparse
+import contextlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+from collections import namedtuple
+
+import go_play
+
+# winner is the name of the winning player, or None for a tie.
+# margin is black stones - white stones - komi at the end, moves counts turns played including passes,
+# time_black / time_white are the seconds each side spent choosing moves,
+# reason is "score", "illegal" or "error" (the side at fault loses).
+GameResult = namedtuple("GameResult", ["black", "white", "seed", "winner", "margin", "moves",
+                                       "time_black", "time_white", "reason"])
+
+_players = {} # Players loaded by this pool process, reused by every game it plays
+
+def init_process(root):
+    '''
+    Give a pool process its own working directory.
+
+    File-protocol players talk through input.txt/output.txt in the working directory,
+    so every process needs a private one to play games in parallel.
+
+    :param root: directory to create the working directory in.
+    :return: None.
+    '''
+    os.chdir(tempfile.mkdtemp(dir=root))
+    if go_play.PLAYER_DIR not in sys.path:
+        sys.path.insert(0, go_play.PLAYER_DIR)
+
+def get_player(name, mode, deadline):
+    key = (name, mode, deadline)
+    if key not in _players:
+        _players[key] = go_play.load_player(name, mode, deadline)
+    return _players[key]
+
+def run_game(task):
+    '''
+    Play one game in the current process.
+
+    :param task: (black, white, seed, size, mode, deadline).
+    :return: GameResult.
+    '''
+    black, white, seed, size, mode, deadline = task
+    random.seed(seed)
+    players = {1: get_player(black, mode, deadline), 2: get_player(white, mode, deadline)}
+    stats = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        winner = go_play.play_game(size, black, white, players, stats=stats)
+    return GameResult(black, white, seed, {1: black, 2: white}.get(winner), stats["margin"], stats["moves"],
+                      stats["time"][1], stats["time"][2], stats["reason"])
+
+def schedule(names, games, seed):
+    '''
+    List the games of a round robin.
+
+    Every pair plays the given number of games with colours alternating, and
+    game k of the whole schedule is played with seed + k.
+
+    :param names: player scripts.
+    :param games: games per pair.
+    :param seed: seed of the first game.
+    :return: list of (black, white, seed).
+    '''
+    tasks = []
+    for a, b in itertools.combinations(names, 2):
+        for g in range(games):
+            black, white = (a, b) if g % 2 == 0 else (b, a)
+            tasks.append((black, white, seed + len(tasks)))
+    return tasks
+
+def run_tournament(names, games, seed=0, processes=None, size=5, mode="inproc", deadline=10.0):
+    '''
+    Play a round robin across a process pool.
+
+    Games are independent and the results come back in schedule order. Seeds make
+    in-process players repeatable, worker players keep their own random state.
+
+    :param names: player scripts (no .py) or worker commands.
+    :param games: games per pair.
+    :param seed: seed of the first game.
+    :param processes: pool size, all cores by default.
+    :param size: board size.
+    :param mode: "inproc", "worker" or "file", see go_play.load_player.
+    :param deadline: seconds per move in worker mode.
+    :return: list of GameResult.
+    '''
+    tasks = [(black, white, game_seed, size, mode, deadline) for black, white, game_seed in schedule(names, games, seed)]
+    root = tempfile.mkdtemp(prefix="go_tournament_")
+    try:
+        with multiprocessing.Pool(processes or os.cpu_count(), initializer=init_process, initargs=(root,)) as pool:
+            return pool.map(run_game, tasks, chunksize=1)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def score_to_elo(score):
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+def elo_difference(wins, draws, losses):
+    '''
+    Elo difference implied by a match score, with a 95% confidence interval.
+
+    The score counts a win 1, a draw 0.5 and a loss 0, plus one pseudo-draw so
+    that a perfect or zero score still gives a finite Elo. The interval is the
+    Wilson score interval of that score, which stays inside (0, 1).
+
+    :return: (elo, low, high). Without games the bounds are infinite.
+    '''
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0, -math.inf, math.inf
+    n += 1
+    score = (wins + 0.5 * draws + 0.5) / n
+    z = 1.96
+    center = (score + z * z / (2 * n)) / (1 + z * z / n)
+    error = z / (1 + z * z / n) * math.sqrt(score * (1 - score) / n + z * z / (4 * n * n))
+    return score_to_elo(score), score_to_elo(center - error), score_to_elo(center + error)
+
+def pair_record(results, a, b):
+    '''
+    Wins, draws and losses of a against b.
+
+    :return: (wins, draws, losses).
+    '''
+    wins = draws = losses = 0
+    for r in results:
+        if {r.black, r.white} != {a, b}:
+            continue
+        if r.winner is None:
+            draws += 1
+        elif r.winner == a:
+            wins += 1
+        else:
+            losses += 1
+    return wins, draws, losses
+
+def print_summary(results, names):
+    for a, b in itertools.combinations(names, 2):
+        games = [r for r in results if {r.black, r.white} == {a, b}]
+        if not games:
+            continue
+        wins, draws, losses = pair_record(games, a, b)
+        elo, low, high = elo_difference(wins, draws, losses)
+        # Margin and thinking time are reported from a's side
+        margin = sum(r.margin if r.black == a else -r.margin for r in games) / len(games)
+        time_a = sum(r.time_black if r.black == a else r.time_white for r in games) / len(games)
+        time_b = sum(r.time_white if r.black == a else r.time_black for r in games) / len(games)
+        moves = sum(r.moves for r in games) / len(games)
+        faults = sum(1 for r in games if r.reason != "score")
+        print(f"{a} vs {b}: +{wins} ={draws} -{losses}  Elo {elo:+.0f} [{low:+.0f}, {high:+.0f}]")
+        print(f"    平均子数差 {margin:+.2f} | 平均手数 {moves:.1f} | 每局用时 {a} {time_a:.2f}s, {b} {time_b:.2f}s")
+        if faults:
+            print(f"    ⚠️ 非法落子或出错局数: {faults}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("players", nargs="+", help="player scripts (no .py) or worker commands, every pair plays")
+    parser.add_argument("-g", "--games", type=int, default=100, help="games per pair, colours alternate")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("-j", "--processes", type=int, default=0, help="pool size, 0 uses all cores")
+    parser.add_argument("-n", type=int, default=5, help="board size")
+    parser.add_argument("-m", "--mode", choices=["inproc", "worker", "file"], default="inproc",
+                        help="how players are run, see go_play.py")
+    parser.add_argument("-d", "--deadline", type=float, default=10.0, help="seconds per move in worker mode")
+    parser.add_argument("-o", "--output", help="write one JSON result per game to this file")
+    args = parser.parse_args()
+
+    results = run_tournament(args.players, args.games, args.seed, args.processes or None, args.n,
+                             args.mode, args.deadline)
+    if args.output:
+        with open(args.output, "w") as f:
+            for r in results:
+                f.write(json.dumps(r._asdict()) + "\n")
+    print_summary(results, args.players)
+
+if __name__ == "__main__":
+    main()